@@ -1,19 +1,53 @@
 import os
 import json
 import logging
-from typing import Dict, List, Optional
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, List, Mapping, Optional
+from PyQt6.QtCore import QTimer
+
+RECENT_SEARCH_LIMIT = 10
+SAVE_DELAY_MS = 500
 
 class Config:
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
-        self.settings = self.load_config()
+        self._last_serialized: Optional[bytes] = None
+        self._settings: Optional[Dict] = None
+        self._ext_to_category: Optional[Mapping[str, str]] = None
+        self._recent: Optional[Deque[str]] = None
+        self._save_timer: Optional[QTimer] = None
+
+    @property
+    def settings(self) -> Dict:
+        """Configuration settings, loaded from disk on first access"""
+        if self._settings is None:
+            self._settings = self.load_config()
+        return self._settings
+
+    @settings.setter
+    def settings(self, value: Dict):
+        self._settings = value
+        self._ext_to_category = None
+        self._recent = None
+
+    @property
+    def ext_to_category(self) -> Mapping[str, str]:
+        """Read-only extension -> file category lookup, built on first access"""
+        if self._ext_to_category is None:
+            self._ext_to_category = self._build_ext_to_category()
+        return self._ext_to_category
 
     def load_config(self) -> Dict:
         """Load configuration from JSON file"""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                settings = json.loads(raw)
+                # Remember what is on disk so an unchanged save is skipped
+                self._last_serialized = self._serialize(settings)
+                return settings
             return self.get_default_config()
         except Exception as e:
             logging.error(f"Error loading config: {str(e)}")
@@ -22,13 +56,32 @@ class Config:
     def save_config(self) -> bool:
         """Save current configuration to JSON file"""
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+            # A direct save covers any write still waiting on the timer
+            if self._save_timer is not None:
+                self._save_timer.stop()
+            self._sync_recent()
+            serialized = self._serialize(self.settings)
+            if serialized == self._last_serialized:
+                # Nothing changed since the last write
+                return True
+            # Write a sibling temp file and swap it in so a crash never leaves a partial config
+            temp_path = self.config_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(serialized)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_path)
+            self._last_serialized = serialized
             return True
         except Exception as e:
             logging.error(f"Error saving config: {str(e)}")
             return False
 
+    @staticmethod
+    def _serialize(settings: Dict) -> bytes:
+        """Serialize settings exactly as they are written to disk"""
+        return json.dumps(settings, indent=4).encode('utf-8')
+
     def get_default_config(self) -> Dict:
         """Return default configuration settings"""
         return {
@@ -39,7 +92,8 @@ class Config:
             },
             "metadata": {
                 "path": "metadata.xlsx",
-                "backup_dir": "metadata_backups"
+                "backup_dir": "metadata_backups",
+                "auto_save": False
             },
             "ui": {
                 "window_size": [1200, 800],
@@ -53,6 +107,19 @@ class Config:
             }
         }
 
+    def _build_ext_to_category(self) -> Mapping[str, str]:
+        """Build read-only extension -> file category lookup"""
+        ext_to_category = {}
+        for category, extensions in self.settings.get("file_types", {}).items():
+            for ext in extensions:
+                # First category listed wins for shared extensions (e.g. .pdf)
+                ext_to_category.setdefault(ext.lower(), category)
+        return MappingProxyType(ext_to_category)
+
+    def get_file_category(self, extension: str) -> Optional[str]:
+        """Return configured category for a file extension"""
+        return self.ext_to_category.get(extension.lower())
+
     def get_network_paths(self) -> Dict[str, str]:
         """Return configured network paths"""
         return self.settings.get("network_paths", {})
@@ -63,12 +130,17 @@ class Config:
 
     def get_ui_settings(self) -> Dict:
         """Return UI configuration"""
+        self._sync_recent()
         return self.settings.get("ui", {})
 
     def update_setting(self, key: str, value: any) -> bool:
         """Update specific configuration setting"""
         try:
             self.settings[key] = value
+            if key == "file_types":
+                self._ext_to_category = None
+            elif key == "ui":
+                self._recent = None
             return self.save_config()
         except Exception as e:
             logging.error(f"Error updating setting: {str(e)}")
@@ -76,12 +148,29 @@ class Config:
 
     def add_recent_search(self, search_term: str):
         """Add search term to recent searches list"""
-        recent = self.settings["ui"]["recent_searches"]
-        if search_term in recent:
-            recent.remove(search_term)
-        recent.insert(0, search_term)
-        self.settings["ui"]["recent_searches"] = recent[:10]
-        self.save_config()
+        if self._recent is None:
+            ui = self.settings.setdefault("ui", {})
+            self._recent = deque(ui.get("recent_searches", []), maxlen=RECENT_SEARCH_LIMIT)
+        try:
+            self._recent.remove(search_term)
+        except ValueError:
+            pass
+        self._recent.appendleft(search_term)
+        self.schedule_save()
+
+    def _sync_recent(self):
+        """Copy the recent searches deque back into settings"""
+        if self._recent is not None:
+            self.settings["ui"]["recent_searches"] = list(self._recent)
+
+    def schedule_save(self):
+        """Save shortly, folding bursts of changes into one write"""
+        if self._save_timer is None:
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.setInterval(SAVE_DELAY_MS)
+            self._save_timer.timeout.connect(self.save_config)
+        self._save_timer.start()
 
     @staticmethod
     def create_default():
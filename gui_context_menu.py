@@ -2,6 +2,7 @@
 from PyQt6.QtWidgets import QMenu
 from PyQt6.QtCore import Qt
 import os
+import logging
 
 class FileContextMenu:
     def __init__(self, parent=None):
@@ -31,15 +32,20 @@ class FileContextMenu:
     def open_file(self):
         """Open selected file with default application"""
         for file_path in self.selected_files:
-            if os.path.exists(file_path):
+            # startfile raises for missing paths, no need to stat first
+            try:
                 os.startfile(file_path)
+            except OSError as e:
+                logging.error(f"Error opening {file_path}: {str(e)}")
 
     def open_folder(self):
         """Open containing folder in explorer"""
         for file_path in self.selected_files:
             folder = os.path.dirname(file_path)
-            if os.path.exists(folder):
+            try:
                 os.startfile(folder)
+            except OSError as e:
+                logging.error(f"Error opening folder {folder}: {str(e)}")
 
     def edit_metadata(self):
         """Open metadata editor for selected file"""
@@ -1,9 +1,71 @@
 from PyQt6.QtWidgets import QTreeView, QMenu, QStyle, QMessageBox
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QStandardItemModel, QStandardItem, QColor, QFont
+from PyQt6.QtCore import (Qt, pyqtSignal, QFileSystemWatcher, QEvent, QObject,
+                          QRunnable, QThreadPool, QTimer)
 import os
 import logging
-from datetime import datetime
+from models_file_tree_model import FileTreeModel, FileNode
+
+_SCAN_BATCH_SIZE = 256
+# A burst of change notifications for a folder becomes one rescan
+_CHANGE_DEBOUNCE_MS = 300
+
+
+def _scan_entry(entry, safety, parent_protected):
+    """
+    Build a tree node from a directory entry, or None for an unreadable folder
+    Files inherit the readability of the folder being listed, so only folders are checked
+    """
+    path = entry.path
+    protected = parent_protected or safety.is_protected_path(path)
+    if entry.is_file():
+        stats = entry.stat()
+        return FileNode(path, entry.name, True, stats.st_mtime, stats.st_size, protected)
+    if not safety.safe_read_operation(path):
+        return None
+    return FileNode(path, entry.name, False, protected=protected)
+
+
+class _ScanSignals(QObject):
+    batchReady = pyqtSignal(str, int, list)  # folder path, generation, nodes
+    finished = pyqtSignal(str, int, object)  # folder path, generation, error or None
+
+
+class _ScanWorker(QRunnable):
+    """Scan one folder off the GUI thread and report entries in batches"""
+
+    def __init__(self, path, safety_manager, parent_protected, generation):
+        super().__init__()
+        self.path = path
+        self.safety = safety_manager
+        self.parent_protected = parent_protected
+        self.generation = generation
+        self.signals = _ScanSignals()
+
+    def run(self):
+        batch = []
+        error = None
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    try:
+                        node = _scan_entry(entry, self.safety, self.parent_protected)
+                    except OSError as e:
+                        logging.error(f"Error reading {entry.path}: {str(e)}")
+                        continue
+                    if node is None:
+                        continue
+                    batch.append(node)
+                    if len(batch) >= _SCAN_BATCH_SIZE:
+                        self.signals.batchReady.emit(self.path, self.generation, batch)
+                        batch = []
+        except Exception as e:
+            error = e
+            logging.error(f"Error scanning {self.path}: {str(e)}")
+        finally:
+            if batch:
+                self.signals.batchReady.emit(self.path, self.generation, batch)
+            self.signals.finished.emit(self.path, self.generation, error)
+
 
 class FileTreeView(QTreeView):
     fileSelected = pyqtSignal(str)
@@ -12,14 +74,34 @@ class FileTreeView(QTreeView):
     def __init__(self, safety_manager, parent=None):
         super().__init__(parent)
         self.safety = safety_manager
+        self._protected_cache = {}
+        self._readable_cache = {}
+        self._root_path = None
+        self._path_to_node = {}
+        self._loaded_dirs = {}
+        self._pending_scans = {}  # folder path -> node awaiting scan results
+        self._pending_refreshes = {}  # folder path -> nodes collected by its rescan so far
+        self._changed_dirs = set()  # watched folders waiting for the debounce timer
+        self._change_timer = QTimer(self)
+        self._change_timer.setSingleShot(True)
+        self._change_timer.setInterval(_CHANGE_DEBOUNCE_MS)
+        self._change_timer.timeout.connect(self._refresh_changed_dirs)
+        self._scan_generation = 0
+        self.watcher = QFileSystemWatcher(self)
         self.setup_model()
         self.setup_ui()
+        self.setup_context_menus()
         self.connect_signals()
 
+    def changeEvent(self, event):
+        """Rebuild shared fonts when the application font changes"""
+        if event.type() == QEvent.Type.FontChange:
+            self.model.rebuild_fonts()
+        super().changeEvent(event)
+
     def setup_model(self):
         """Initialize tree model"""
-        self.model = QStandardItemModel()
-        self.model.setHorizontalHeaderLabels(['Name', 'Type', 'Modified', 'Size', 'Status'])
+        self.model = FileTreeModel(self)
         self.setModel(self.model)
         
     def setup_ui(self):
@@ -28,6 +110,7 @@ class FileTreeView(QTreeView):
         self.setSortingEnabled(True)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.setExpandsOnDoubleClick(False)
+        self.setUniformRowHeights(True)  # Rows share one height, so Qt skips per-row size hints
         
         # Configure columns
         self.header().setStretchLastSection(False)
@@ -41,124 +124,279 @@ class FileTreeView(QTreeView):
         """Connect signal handlers"""
         self.doubleClicked.connect(self.handle_double_click)
         self.customContextMenuRequested.connect(self.show_context_menu)
+        self.model.fetchRequested.connect(self.handle_fetch_requested)
+        self.watcher.directoryChanged.connect(self.handle_directory_changed)
 
     def populate_tree(self, root_path):
-        """Populate tree with files from root path"""
+        """Populate tree with the direct children of root path"""
         try:
-            self.model.clear()
-            self.model.setHorizontalHeaderLabels(['Name', 'Type', 'Modified', 'Size', 'Status'])
-            root_item = self.model.invisibleRootItem()
-            self._add_tree_items(root_path, root_item)
+            self._protected_cache.clear()
+            self._readable_cache.clear()
+            self._path_to_node.clear()
+            self._loaded_dirs.clear()
+            self._pending_scans.clear()
+            self._pending_refreshes.clear()
+            self._changed_dirs.clear()
+            self._change_timer.stop()
+            self._scan_generation += 1
+            watched = self.watcher.directories()
+            if watched:
+                self.watcher.removePaths(watched)
+
+            self._root_path = root_path
+            self._add_tree_items(root_path, self.model.set_root(root_path))
         except Exception as e:
             logging.error(f"Error populating tree: {str(e)}")
 
-    def _add_tree_items(self, path, parent_item):
-        """Recursively add items to tree with read-only indication"""
+    def refresh_tree(self, root_path=None):
+        """Refresh loaded folders in place, touching only rows that changed"""
+        try:
+            if root_path is None:
+                root_path = self._root_path
+            if not self._root_path or root_path != self._root_path:
+                self.populate_tree(root_path)
+                return
+
+            self._protected_cache.clear()
+            self._readable_cache.clear()
+            for path in list(self._loaded_dirs):
+                self._refresh_folder(path)
+        except Exception as e:
+            logging.error(f"Error refreshing tree: {str(e)}")
+
+    def _add_tree_items(self, path, parent_node):
+        """Scan the direct children of path on a worker thread"""
         try:
-            for item in os.scandir(path):
-                if not self.safety.safe_read_operation(item.path):
-                    continue
-
-                tree_item = QStandardItem(item.name)
-                tree_item.setData(item.path, Qt.ItemDataRole.UserRole)
-                
-                # Set read-only visual indicators
-                if self.safety.is_protected_path(item.path):
-                    font = tree_item.font()
-                    font.setItalic(True)
-                    tree_item.setFont(font)
-                    tree_item.setForeground(QColor(128, 128, 128))
-                    status_text = "Read Only"
-                else:
-                    status_text = "Writable"
-
-                # Add file metadata
-                if item.is_file():
-                    size_item = QStandardItem(self._format_size(item.stat().st_size))
-                    type_item = QStandardItem(os.path.splitext(item.name)[1])
-                    modified_item = QStandardItem(self._format_date(item.stat().st_mtime))
-                else:
-                    size_item = QStandardItem("")
-                    type_item = QStandardItem("Folder")
-                    modified_item = QStandardItem("")
-
-                status_item = QStandardItem(status_text)
-                
-                row = [tree_item, type_item, modified_item, size_item, status_item]
-                parent_item.appendRow(row)
-                
-                if item.is_dir():
-                    self._add_tree_items(item.path, tree_item)
+            if path in self._pending_scans:
+                return
+
+            # Protection is prefix based, so a protected folder covers all its children
+            parent_protected = self._is_protected(path)
+
+            self._pending_scans[path] = parent_node
+            worker = _ScanWorker(path, self.safety, parent_protected, self._scan_generation)
+            worker.signals.batchReady.connect(self._handle_scan_batch)
+            worker.signals.finished.connect(self._handle_scan_finished)
+            QThreadPool.globalInstance().start(worker)
 
         except Exception as e:
             logging.error(f"Error adding tree items for {path}: {str(e)}")
 
+    def handle_fetch_requested(self, node):
+        """Load folder contents the first time a folder is expanded"""
+        self._add_tree_items(node.path, node)
+
+    def _handle_scan_batch(self, path, generation, nodes):
+        """Add a batch of scanned entries under their folder"""
+        try:
+            parent_node = self._pending_scans.get(path)
+            if generation != self._scan_generation or parent_node is None:
+                return  # Tree was repopulated since the scan started
+
+            self.model.add_children(parent_node, nodes)
+            for node in nodes:
+                self._path_to_node[node.path] = node
+                self._protected_cache[node.path] = node.protected
+        except Exception as e:
+            logging.error(f"Error adding scanned items for {path}: {str(e)}")
+
+    def _handle_scan_finished(self, path, generation, error):
+        """Mark a folder as loaded once its scan completes"""
+        try:
+            if generation != self._scan_generation:
+                return
+            parent_node = self._pending_scans.pop(path, None)
+            if parent_node is not None:
+                self.model.finish_fetch(parent_node)
+                self._mark_loaded(path, parent_node)
+        except Exception as e:
+            logging.error(f"Error finishing scan for {path}: {str(e)}")
+
+    def _refresh_folder(self, path):
+        """Rescan one loaded folder on a worker thread; the results are diffed on arrival"""
+        try:
+            if path in self._pending_refreshes:
+                # Rescan again once the running scan has reported
+                self._changed_dirs.add(path)
+                self._change_timer.start()
+                return
+
+            self._pending_refreshes[path] = []
+            worker = _ScanWorker(path, self.safety, self._is_protected(path), self._scan_generation)
+            worker.signals.batchReady.connect(self._handle_refresh_batch)
+            worker.signals.finished.connect(self._handle_refresh_finished)
+            QThreadPool.globalInstance().start(worker)
+        except Exception as e:
+            logging.error(f"Error refreshing folder {path}: {str(e)}")
+
+    def _handle_refresh_batch(self, path, generation, nodes):
+        """Collect a batch of rescanned entries until the folder is complete"""
+        scanned = self._pending_refreshes.get(path)
+        if generation == self._scan_generation and scanned is not None:
+            scanned.extend(nodes)
+
+    def _handle_refresh_finished(self, path, generation, error):
+        """Apply a completed rescan, unless the folder went away meanwhile"""
+        try:
+            if generation != self._scan_generation:
+                return
+            scanned = self._pending_refreshes.pop(path, None)
+            if scanned is None or path not in self._loaded_dirs:
+                return
+            if isinstance(error, FileNotFoundError):
+                self._forget_path(path)
+            elif error is None:
+                self._apply_refresh(path, scanned)
+        except Exception as e:
+            logging.error(f"Error refreshing folder {path}: {str(e)}")
+
+    def _apply_refresh(self, path, nodes):
+        """Apply inserts, removals and updates for one loaded folder"""
+        parent_node = self._loaded_dirs[path]
+        scanned = {node.path: node for node in nodes}
+
+        # Drop rows for entries that no longer exist
+        for row in reversed(range(len(parent_node.children))):
+            child_path = parent_node.children[row].path
+            if child_path not in scanned:
+                self._forget_path(child_path)
+                self.model.remove_child(parent_node, row)
+
+        new_nodes = []
+        for entry_path, node in scanned.items():
+            existing = self._path_to_node.get(entry_path)
+            if existing is None:
+                new_nodes.append(node)
+                self._path_to_node[entry_path] = node
+            elif node.is_file:
+                self.model.update_stats(existing, node.mtime, node.size)
+        self.model.add_children(parent_node, new_nodes)
+
+    def _mark_loaded(self, path, node):
+        """Track a folder whose children are in the tree and watch it for changes"""
+        self._loaded_dirs[path] = node
+        if not self.watcher.addPath(path):
+            logging.info(f"Not watching folder for changes: {path}")
+
+    def _forget_path(self, path):
+        """Remove a path and everything below it from the lookup tables"""
+        prefix = os.path.join(path, '')
+        for known in [p for p in self._path_to_node if p == path or p.startswith(prefix)]:
+            del self._path_to_node[known]
+        for known in [p for p in self._loaded_dirs if p == path or p.startswith(prefix)]:
+            del self._loaded_dirs[known]
+            self.watcher.removePath(known)
+
+    def handle_directory_changed(self, path):
+        """Queue a rescan of a watched folder when its contents change on disk"""
+        if path in self._loaded_dirs:
+            self._changed_dirs.add(path)
+            self._change_timer.start()  # restarted by each event in a burst
+
+    def _refresh_changed_dirs(self):
+        """Rescan every folder that changed during the debounce interval"""
+        changed, self._changed_dirs = self._changed_dirs, set()
+        for path in changed:
+            if path in self._loaded_dirs:
+                self._refresh_folder(path)
+
+    def _is_protected(self, path):
+        """Cached safety.is_protected_path for the current tree"""
+        protected = self._protected_cache.get(path)
+        if protected is None:
+            protected = self.safety.is_protected_path(path)
+            self._protected_cache[path] = protected
+        return protected
+
+    def _is_readable(self, path):
+        """Cached safety.safe_read_operation for the current tree"""
+        readable = self._readable_cache.get(path)
+        if readable is None:
+            readable = self.safety.safe_read_operation(path)
+            self._readable_cache[path] = readable
+        return readable
+
     def handle_double_click(self, index):
         """Handle item double-click"""
         try:
-            item = self.model.itemFromIndex(index)
-            if item:
-                file_path = item.data(Qt.ItemDataRole.UserRole)
-                if os.path.isfile(file_path) and self.safety.safe_read_operation(file_path):
-                    self.fileSelected.emit(file_path)
+            node = self.model.node_from_index(index)
+            if node.is_file and self._is_readable(node.path):
+                self.fileSelected.emit(node.path)
         except Exception as e:
             logging.error(f"Error handling double click: {str(e)}")
 
     def get_selected_file_paths(self):
         """Get paths of all selected files"""
         try:
-            paths = []
+            paths = {}  # Ordered and free of duplicates
             for index in self.selectedIndexes():
                 if index.column() == 0:  # Only process first column to avoid duplicates
-                    item = self.model.itemFromIndex(index)
-                    file_path = item.data(Qt.ItemDataRole.UserRole)
-                    if os.path.isfile(file_path):  # Only include files, not directories
-                        paths.append(file_path)
-            return list(set(paths))  # Remove any duplicates
+                    node = self.model.node_from_index(index)
+                    if node.is_file:  # Only include files, not directories
+                        paths.setdefault(node.path, None)
+            return list(paths)
         except Exception as e:
             logging.error(f"Error getting selected file paths: {str(e)}")
             return []
 
+    def setup_context_menus(self):
+        """Build the context menus once; actions read the current target paths"""
+        self._context_paths = []
+
+        self._menu_multi = QMenu(self)
+        self._menu_multi.addAction("Add Files to Database", self._add_context_files)
+
+        self._menu_single = QMenu(self)
+        self._menu_single.addAction("Add Files to Database", self._add_context_files)
+        self._menu_single.addSeparator()
+        self._open_action = self._menu_single.addAction("Open", self._open_context_file)
+        self._menu_single.addAction("Show in Explorer", self._show_context_in_explorer)
+        self._menu_single.addAction("Properties", self._show_context_properties)
+
     def show_context_menu(self, position):
         """Show right-click context menu"""
         try:
-            indexes = self.selectedIndexes()
-            if not indexes:
-                return
-
-            menu = QMenu()
-            
             # Get selected file paths
             selected_paths = self.get_selected_file_paths()
-            
-            if len(selected_paths) > 0:
-                # Add metadata option for multiple files
-                menu.addAction("Add Files to Database", lambda: self.add_files_to_database(selected_paths))
-                menu.addSeparator()
-            
+            if not selected_paths:
+                return
+
+            self._context_paths = selected_paths
             if len(selected_paths) == 1:
                 # Single file options
-                file_path = selected_paths[0]
-                if not self.safety.is_protected_path(file_path):
-                    menu.addAction("Open", lambda: self.handle_double_click(indexes[0]))
-                menu.addAction("Show in Explorer", lambda: self._show_in_explorer(file_path))
-                menu.addAction("Properties", lambda: self._show_properties(file_path))
+                self._open_action.setVisible(not self._is_protected(selected_paths[0]))
+                menu = self._menu_single
+            else:
+                menu = self._menu_multi
             
             menu.exec(self.viewport().mapToGlobal(position))
             
         except Exception as e:
             logging.error(f"Error showing context menu: {str(e)}")
 
+    def _add_context_files(self):
+        """Add the context menu's files to the database"""
+        self.add_files_to_database(list(self._context_paths))
+
+    def _open_context_file(self):
+        """Open the context menu's file, as a double-click would"""
+        file_path = self._context_paths[0]
+        if self._is_readable(file_path):
+            self.fileSelected.emit(file_path)
+
+    def _show_context_in_explorer(self):
+        """Show the context menu's file in explorer"""
+        self._show_in_explorer(self._context_paths[0])
+
+    def _show_context_properties(self):
+        """Show properties for the context menu's file"""
+        self._show_properties(self._context_paths[0])
+
     def add_files_to_database(self, file_paths):
         """Add selected files to metadata database"""
         try:
-            # Emit signal with list of files to be added
+            # The add runs in the background; the main window reports how it went
             self.filesAdded.emit(file_paths)
-            
-            # Show confirmation
-            count = len(file_paths)
-            QMessageBox.information(self, "Success", 
-                                  f"Added {count} file{'s' if count != 1 else ''} to database.")
         except Exception as e:
             logging.error(f"Error adding files to database: {str(e)}")
             QMessageBox.critical(self, "Error", 
@@ -167,8 +405,8 @@ class FileTreeView(QTreeView):
     def _show_in_explorer(self, path):
         """Show file in explorer"""
         try:
-            if os.path.exists(path):
-                os.startfile(os.path.dirname(path))
+            # startfile raises for a missing folder, no need to stat first
+            os.startfile(os.path.dirname(path))
         except Exception as e:
             logging.error(f"Error showing in explorer: {str(e)}")
 
@@ -179,18 +417,3 @@ class FileTreeView(QTreeView):
                 self.parent().show_properties_dialog(path)
         except Exception as e:
             logging.error(f"Error showing properties: {str(e)}")
-
-    @staticmethod
-    def _format_size(size):
-        """Format file size for display"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} TB"
-
-    @staticmethod
-    def _format_date(timestamp):
-        """Format date for display"""
-        from datetime import datetime
-        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
\ No newline at end of file
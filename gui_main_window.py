@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QSplitter, QMenuBar, QStatusBar, QToolBar, QMessageBox,
-                            QFileDialog, QLabel)
-from PyQt6.QtCore import Qt
+                            QFileDialog, QLabel, QApplication)
+from PyQt6.QtGui import QAction
+from PyQt6.QtCore import (Qt, QObject, QThread, QTimer, QByteArray, QRunnable, QThreadPool,
+                          pyqtSignal, pyqtSlot)
 import logging
 import os
 from gui_search_panel import SearchPanel
@@ -9,16 +11,156 @@ from gui_file_tree import FileTreeView
 from gui_metadata_editor import MetadataEditor
 from utils_metadata_manager import MetadataManager
 
+_HOME = os.path.expanduser('~')
+
+_STYLESHEET = """
+QMainWindow {
+    background-color: #2b2b2b;
+    color: #ffffff;
+}
+QTreeView {
+    background-color: #2b2b2b;
+    color: #ffffff;
+    border: 1px solid #3f3f3f;
+}
+QTreeView::item:hover {
+    background-color: #363636;
+}
+QTreeView::item:selected {
+    background-color: #404040;
+}
+QHeaderView::section {
+    background-color: #323232;
+    color: #ffffff;
+    padding: 4px;
+    border: none;
+}
+QPushButton {
+    background-color: #404040;
+    color: #ffffff;
+    border: none;
+    padding: 6px 12px;
+    min-width: 80px;
+}
+QPushButton:hover {
+    background-color: #4a4a4a;
+}
+QLabel {
+    color: #ffffff;
+}
+QStatusBar {
+    background-color: #323232;
+    color: #ffffff;
+}
+QToolBar {
+    background-color: #323232;
+    border: none;
+    spacing: 10px;
+    padding: 5px;
+}
+QMenuBar {
+    background-color: #323232;
+    color: #ffffff;
+}
+QMenuBar::item:selected {
+    background-color: #404040;
+}
+"""
+
+
+class _MetadataWorker(QObject):
+    """Run metadata database writes on a background thread, one at a time"""
+    filesAdded = pyqtSignal(list, bool)  # file paths, success
+    metadataLoaded = pyqtSignal()
+
+    def __init__(self, metadata_manager):
+        super().__init__()
+        self.metadata_manager = metadata_manager
+
+    @pyqtSlot(list)
+    def add_files(self, file_paths):
+        try:
+            success = self.metadata_manager.add_files_basic_metadata(file_paths)
+        except Exception as e:
+            logging.error(f"Error adding files in background: {str(e)}")
+            success = False
+        self.filesAdded.emit(file_paths, success)
+
+    @pyqtSlot()
+    def load_metadata(self):
+        """Read the store and summarize it, so the GUI thread finds both ready"""
+        try:
+            self.metadata_manager.get_statistics()
+        except Exception as e:
+            logging.error(f"Error loading metadata in background: {str(e)}")
+        self.metadataLoaded.emit()
+
+    @pyqtSlot()
+    def stop(self):
+        """Stop the worker thread; queued after the adds, so those run first"""
+        self.thread().quit()
+
+
+class _SaveRunnable(QRunnable):
+    """Write the metadata database without holding up window close"""
+
+    def __init__(self, metadata_manager):
+        super().__init__()
+        self.metadata_manager = metadata_manager
+
+    def run(self):
+        try:
+            self.metadata_manager.save_database()
+        except Exception as e:
+            logging.error(f"Error saving metadata during close: {str(e)}")
+
+
 class MainWindow(QMainWindow):
+    addFilesRequested = pyqtSignal(list)  # Queued to the metadata worker thread
+    stopWorkerRequested = pyqtSignal()  # Queued behind any pending adds
+    loadMetadataRequested = pyqtSignal()  # Reads the store on the worker thread
+
+    # Menu and toolbar layout as (label, handler name); None marks a separator
+    _MENUS = (
+        ("&File", (
+            ("Open Project Folder", "open_project_folder"),
+            ("Refresh", "refresh_view"),
+            ("Open Metadata Excel", "open_metadata_excel"),
+            None,
+            ("Exit", "close"),
+        )),
+        ("&View", (
+            ("Refresh", "refresh_view"),
+            ("Show Statistics", "show_statistics"),
+        )),
+        ("&Tools", (
+            ("Add Selected Files to Database", "add_selected_to_database"),
+            ("Clear Metadata Cache", "clear_metadata_cache"),
+        )),
+        ("&Help", (
+            ("About", "show_about"),
+        )),
+    )
+    _TOOLBAR = (
+        ("Refresh", "refresh_view"),
+        ("Add to Database", "add_selected_to_database"),
+    )
+
     def __init__(self, config, safety_manager):
         super().__init__()
         self.config = config
         self.safety = safety_manager
+        self._error_box = None
+        self._stats_box = None
+        self._stopping_worker = False
+        self._save_pool = QThreadPool(self)
+        self._actions = {}  # (label, handler name) -> QAction shared by menus and toolbar
         try:
             # Initialize metadata manager
             metadata_path = os.path.join("local_metadata", "metadata.xlsx")
             os.makedirs("local_metadata", exist_ok=True)
             self.metadata_manager = MetadataManager(self.safety, metadata_path)
+            self.setup_metadata_worker()
             
             # Setup UI
             self.setup_ui()
@@ -30,12 +172,25 @@ class MainWindow(QMainWindow):
             self.connect_signals()
             self.load_initial_directory()
             
-            # Show initial statistics
+            # Show initial statistics once the store has been read in the background
             self.update_status_statistics()
+            self.loadMetadataRequested.emit()
         except Exception as e:
             logging.error(f"Error initializing MainWindow: {str(e)}")
             raise
 
+    def setup_metadata_worker(self):
+        """Start the thread that performs metadata database writes"""
+        self.metadata_thread = QThread(self)
+        self.metadata_worker = _MetadataWorker(self.metadata_manager)
+        self.metadata_worker.moveToThread(self.metadata_thread)
+        self.addFilesRequested.connect(self.metadata_worker.add_files)
+        self.stopWorkerRequested.connect(self.metadata_worker.stop)
+        self.loadMetadataRequested.connect(self.metadata_worker.load_metadata)
+        self.metadata_worker.metadataLoaded.connect(self.update_status_statistics)
+        self.metadata_worker.filesAdded.connect(self.handle_files_added_finished)
+        self.metadata_thread.start()
+
     def setup_ui(self):
         """Initialize main UI components"""
         try:
@@ -74,6 +229,8 @@ class MainWindow(QMainWindow):
             
             # Right side: Metadata panel
             self.metadata_editor = MetadataEditor(self.safety, self)
+            self.metadata_editor.set_auto_save(
+                self.config.get_metadata_settings().get('auto_save', False))
             
             # Add widgets to splitter
             self.splitter.addWidget(self.left_widget)
@@ -94,45 +251,50 @@ class MainWindow(QMainWindow):
         try:
             self.menubar = self.menuBar()
             
-            # File menu
-            file_menu = self.menubar.addMenu("&File")
-            file_menu.addAction("Open Project Folder", self.open_project_folder)
-            file_menu.addAction("Refresh", self.refresh_view)
-            file_menu.addAction("Open Metadata Excel", self.open_metadata_excel)
-            file_menu.addSeparator()
-            file_menu.addAction("Exit", self.close)
-            
-            # View menu
-            view_menu = self.menubar.addMenu("&View")
-            view_menu.addAction("Refresh", self.refresh_view)
-            view_menu.addAction("Show Statistics", self.show_statistics)
-            
-            # Tools menu
-            tools_menu = self.menubar.addMenu("&Tools")
-            tools_menu.addAction("Add Selected Files to Database", self.add_selected_to_database)
-            tools_menu.addAction("Clear Metadata Cache", self.clear_metadata_cache)
-            
-            # Help menu
-            help_menu = self.menubar.addMenu("&Help")
-            help_menu.addAction("About", self.show_about)
+            for menu_label, items in self._MENUS:
+                menu = self.menubar.addMenu(menu_label)
+                for item in items:
+                    if item is None:
+                        menu.addSeparator()
+                    else:
+                        menu.addAction(self._get_action(*item))
             
         except Exception as e:
             logging.error(f"Error in setup_menubar: {str(e)}")
             raise
 
+    def _get_action(self, label, method_name):
+        """Return the shared action for a label and handler, creating it once"""
+        key = (label, method_name)
+        action = self._actions.get(key)
+        if action is None:
+            action = QAction(label, self)
+            action.triggered.connect(getattr(self, method_name))
+            self._actions[key] = action
+        return action
+
     def setup_toolbar(self):
         """Create main toolbar"""
         try:
             self.toolbar = QToolBar()
+            self.toolbar.setObjectName("mainToolbar")  # Required for saveState/restoreState
             self.addToolBar(self.toolbar)
             
             # Add toolbar actions
-            self.toolbar.addAction("Refresh", self.refresh_view)
-            self.toolbar.addAction("Add to Database", self.add_selected_to_database)
+            for item in self._TOOLBAR:
+                self.toolbar.addAction(self._get_action(*item))
             
             # Add statistics label
             self.stats_label = QLabel()
             self.toolbar.addWidget(self.stats_label)
+
+            # Back-to-back statistics requests collapse into one recompute
+            self._stats_timer = QTimer(self)
+            self._stats_timer.setSingleShot(True)
+            self._stats_timer.setInterval(150)
+            self._stats_timer.timeout.connect(self._do_update_statistics)
+            self._stats_pending = False
+            self.toolbar.visibilityChanged.connect(self._handle_toolbar_visibility)
             
         except Exception as e:
             logging.error(f"Error in setup_toolbar: {str(e)}")
@@ -144,79 +306,52 @@ class MainWindow(QMainWindow):
             self.statusbar = QStatusBar()
             self.setStatusBar(self.statusbar)
             self.statusbar.showMessage("Ready")
+
+            # Status text is applied at most every 50 ms; the latest message wins
+            self._pending_status = None
+            self._status_timer = QTimer(self)
+            self._status_timer.setSingleShot(True)
+            self._status_timer.setInterval(50)
+            self._status_timer.timeout.connect(self._apply_status_message)
         except Exception as e:
             logging.error(f"Error in setup_statusbar: {str(e)}")
             raise
 
+    def show_status_message(self, message):
+        """Queue a status bar message, coalescing bursts into one repaint"""
+        self._pending_status = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+
+    def _apply_status_message(self):
+        """Show the latest queued status bar message"""
+        if self._pending_status is not None:
+            self.statusbar.showMessage(self._pending_status)
+            self._pending_status = None
+
     def setup_styles(self):
         """Setup application-wide styling"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QTreeView {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border: 1px solid #3f3f3f;
-            }
-            QTreeView::item:hover {
-                background-color: #363636;
-            }
-            QTreeView::item:selected {
-                background-color: #404040;
-            }
-            QHeaderView::section {
-                background-color: #323232;
-                color: #ffffff;
-                padding: 4px;
-                border: none;
-            }
-            QPushButton {
-                background-color: #404040;
-                color: #ffffff;
-                border: none;
-                padding: 6px 12px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QStatusBar {
-                background-color: #323232;
-                color: #ffffff;
-            }
-            QToolBar {
-                background-color: #323232;
-                border: none;
-                spacing: 10px;
-                padding: 5px;
-            }
-            QMenuBar {
-                background-color: #323232;
-                color: #ffffff;
-            }
-            QMenuBar::item:selected {
-                background-color: #404040;
-            }
-        """)
+        # Applied once on the application so every window shares the parsed sheet
+        app = QApplication.instance()
+        if app is not None and app.styleSheet() != _STYLESHEET:
+            app.setStyleSheet(_STYLESHEET)
 
     def connect_signals(self):
         """Connect all signal handlers"""
         try:
+            # Queued so emitters finish and repaint before the handlers run
+            queued = Qt.ConnectionType.QueuedConnection
+
             # Connect search panel signals
-            self.search_panel.searchRequested.connect(self.handle_search)
-            self.search_panel.filterChanged.connect(self.apply_filters)
+            self.search_panel.searchRequested.connect(self.handle_search, queued)
+            self.search_panel.filterChanged.connect(self.apply_filters, queued)
             
             # Connect file tree signals
             self.file_tree.fileSelected.connect(self.handle_file_selected)
             self.file_tree.filesAdded.connect(self.handle_files_added)
             
             # Connect metadata editor signals
-            self.metadata_editor.metadataChanged.connect(self.handle_metadata_changed)
+            self.metadata_editor.metadataChanged.connect(self.handle_metadata_changed, queued)
             
         except Exception as e:
             logging.error(f"Error connecting signals: {str(e)}")
@@ -225,14 +360,13 @@ class MainWindow(QMainWindow):
     def load_initial_directory(self):
         """Load the initial directory into the file tree"""
         try:
-            root_path = self.config.get_network_paths().get('root', os.path.expanduser('~'))
+            root_path = self.config.get_network_paths().get('root', _HOME)
             if os.path.exists(root_path):
                 self.file_tree.populate_tree(root_path)
-                self.statusbar.showMessage(f"Loaded directory: {root_path}")
+                self.show_status_message(f"Loaded directory: {root_path}")
             else:
-                fallback_path = os.path.expanduser('~')
-                self.file_tree.populate_tree(fallback_path)
-                self.statusbar.showMessage(f"Using fallback directory: {fallback_path}")
+                self.file_tree.populate_tree(_HOME)
+                self.show_status_message(f"Using fallback directory: {_HOME}")
         except Exception as e:
             logging.error(f"Error loading initial directory: {str(e)}")
             self.show_error_message("Error", "Failed to load initial directory")
@@ -240,7 +374,9 @@ class MainWindow(QMainWindow):
     def handle_search(self, search_text):
         """Handle search request"""
         try:
-            self.statusbar.showMessage(f"Searching for: {search_text}")
+            self.show_status_message(f"Searching for: {search_text}")
+            if search_text:
+                self.config.add_recent_search(search_text)
             # Implement search functionality
         except Exception as e:
             logging.error(f"Error handling search: {str(e)}")
@@ -249,7 +385,7 @@ class MainWindow(QMainWindow):
     def apply_filters(self, filters):
         """Apply search filters"""
         try:
-            self.statusbar.showMessage("Applying filters...")
+            self.show_status_message("Applying filters...")
             # Implement filter functionality
         except Exception as e:
             logging.error(f"Error applying filters: {str(e)}")
@@ -258,7 +394,7 @@ class MainWindow(QMainWindow):
     def handle_file_selected(self, file_path):
         """Handle file selection"""
         try:
-            self.statusbar.showMessage(f"Selected: {file_path}")
+            self.show_status_message(f"Selected: {file_path}")
             metadata = self.metadata_manager.get_metadata(file_path)
             self.metadata_editor.load_file_metadata(file_path, metadata)
         except Exception as e:
@@ -268,22 +404,31 @@ class MainWindow(QMainWindow):
     def handle_files_added(self, file_paths):
         """Handle adding files to metadata database"""
         try:
-            if self.metadata_manager.add_files_basic_metadata(file_paths):
-                self.statusbar.showMessage(f"Added {len(file_paths)} files to database")
-                self.update_status_statistics()
-            else:
-                self.statusbar.showMessage("Failed to add files to database")
+            self.show_status_message(f"Adding {len(file_paths)} files to database...")
+            self.addFilesRequested.emit(list(file_paths))
         except Exception as e:
             self.show_error_message("Error", f"Failed to add files: {str(e)}")
 
+    def handle_files_added_finished(self, file_paths, success):
+        """Report the result of a background metadata add"""
+        count = len(file_paths)
+        if success:
+            self.show_status_message(f"Added {count} files to database")
+            self.update_status_statistics()
+            QMessageBox.information(self, "Success",
+                                    f"Added {count} file{'s' if count != 1 else ''} to database.")
+        else:
+            self.show_status_message("Failed to add files to database")
+            self.show_error_message("Error", f"Failed to add {count} file{'s' if count != 1 else ''} to database.")
+
     def handle_metadata_changed(self, file_path, metadata):
         """Handle metadata updates"""
         try:
             if self.metadata_manager.update_metadata(file_path, metadata):
-                self.statusbar.showMessage(f"Updated metadata for: {file_path}")
+                self.show_status_message(f"Updated metadata for: {file_path}")
                 self.update_status_statistics()
             else:
-                self.statusbar.showMessage("Failed to update metadata")
+                self.show_status_message("Failed to update metadata")
         except Exception as e:
             logging.error(f"Error handling metadata change: {str(e)}")
             self.show_error_message("Metadata Error", str(e))
@@ -294,7 +439,7 @@ class MainWindow(QMainWindow):
             folder = QFileDialog.getExistingDirectory(self, "Select Project Folder")
             if folder:
                 self.file_tree.populate_tree(folder)
-                self.statusbar.showMessage(f"Opened folder: {folder}")
+                self.show_status_message(f"Opened folder: {folder}")
         except Exception as e:
             logging.error(f"Error opening project folder: {str(e)}")
             self.show_error_message("Folder Error", str(e))
@@ -302,6 +447,8 @@ class MainWindow(QMainWindow):
     def open_metadata_excel(self):
         """Open metadata Excel file"""
         try:
+            # The working store may be Parquet; write a current workbook to open
+            self.metadata_manager.export_to_excel()
             if os.path.exists(self.metadata_manager.excel_path):
                 os.startfile(self.metadata_manager.excel_path)
             else:
@@ -317,7 +464,7 @@ class MainWindow(QMainWindow):
             if selected_files:
                 self.handle_files_added(selected_files)
             else:
-                self.statusbar.showMessage("No files selected")
+                self.show_status_message("No files selected")
         except Exception as e:
             logging.error(f"Error adding selected files: {str(e)}")
             self.show_error_message("Error", str(e))
@@ -326,14 +473,32 @@ class MainWindow(QMainWindow):
         """Clear metadata cache"""
         try:
             self.metadata_manager.clear_cache()
-            self.statusbar.showMessage("Metadata cache cleared")
+            self.show_status_message("Metadata cache cleared")
         except Exception as e:
             logging.error(f"Error clearing metadata cache: {str(e)}")
             self.show_error_message("Error", str(e))
 
     def update_status_statistics(self):
+        """Schedule a status bar statistics update"""
+        self._stats_timer.start()
+
+    def _handle_toolbar_visibility(self, visible):
+        """Catch up on statistics skipped while the toolbar was hidden"""
+        if visible and self._stats_pending:
+            self.update_status_statistics()
+
+    def _do_update_statistics(self):
         """Update status bar with current statistics"""
         try:
+            # Nobody can see the label; recompute once it is shown again
+            if not self.stats_label.isVisible():
+                self._stats_pending = True
+                return
+            self._stats_pending = False
+            # The worker is still reading the store; metadataLoaded triggers another update
+            if not self.metadata_manager.is_loaded():
+                self.stats_label.setText("Files in Database: loading...")
+                return
             stats = self.metadata_manager.get_statistics()
             self.stats_label.setText(
                 f"Files in Database: {stats.get('total_files', 0)} | "
@@ -347,26 +512,38 @@ class MainWindow(QMainWindow):
         """Show detailed statistics dialog"""
         try:
             stats = self.metadata_manager.get_statistics()
-            QMessageBox.information(self, "Database Statistics",
+            if self._stats_box is None:
+                self._stats_box = QMessageBox(QMessageBox.Icon.Information,
+                                              "Database Statistics", "", parent=self)
+            self._stats_box.setText(
                 f"Total Files: {stats.get('total_files', 0)}\n"
-                f"Departments: {', '.join(stats.get('departments', []))}\n"
-                f"File Types: {', '.join(stats.get('file_types', []))}\n"
+                f"Departments: {self._format_list(stats.get('departments', []))}\n"
+                f"File Types: {self._format_list(stats.get('file_types', []))}\n"
                 f"Newest File: {stats.get('newest_file', 'N/A')}\n"
                 f"Oldest File: {stats.get('oldest_file', 'N/A')}"
             )
+            self._stats_box.exec()
         except Exception as e:
             logging.error(f"Error showing statistics: {str(e)}")
             self.show_error_message("Error", str(e))
 
+    @staticmethod
+    def _format_list(values, limit=50):
+        """Join values for display, truncating long lists"""
+        text = ', '.join(values[:limit])
+        if len(values) > limit:
+            text += f" (+{len(values) - limit} more)"
+        return text
+
     def refresh_view(self):
         """Refresh the current view"""
         try:
-            self.statusbar.showMessage("Refreshing view...")
-            current_path = self.config.get_network_paths()['root']
-            self.file_tree.populate_tree(current_path)
+            self.show_status_message("Refreshing view...")
+            # Refresh whichever folder is shown, in place, rather than reloading the configured root
+            self.file_tree.refresh_tree()
             self.metadata_manager.clear_cache()
             self.update_status_statistics()
-            self.statusbar.showMessage("View refreshed")
+            self.show_status_message("View refreshed")
         except Exception as e:
             logging.error(f"Error refreshing view: {str(e)}")
             self.show_error_message("Refresh Error", str(e))
@@ -384,22 +561,50 @@ class MainWindow(QMainWindow):
 
     def show_error_message(self, title, message):
         """Show error message dialog"""
-        QMessageBox.critical(self, title, message)
+        # One box is reused for every error rather than building a new dialog each time
+        if self._error_box is None:
+            self._error_box = QMessageBox(QMessageBox.Icon.Critical, "", "", parent=self)
+        if self._error_box.isVisible():
+            # An error raised while the box is open (from its nested event loop)
+            # must not re-enter exec() on it; show this one in a box of its own
+            QMessageBox.critical(self, title, message)
+            return
+        self._error_box.setWindowTitle(title)
+        self._error_box.setText(message)
+        self._error_box.exec()
 
     def closeEvent(self, event):
         """Handle application close"""
         try:
-            # Save window state
-            self.config.update_setting('ui', {
-                'window_size': [self.width(), self.height()],
-                'splitter_sizes': self.splitter.sizes()
+            # Child widgets get no closeEvent; save edits still waiting on auto-save
+            self.metadata_editor.flush_auto_save()
+
+            # Let queued metadata writes finish before saving; quit() alone would drop them.
+            # The window stays responsive meanwhile and closes once the worker thread ends
+            if self.metadata_thread.isRunning():
+                if not self._stopping_worker:
+                    self._stopping_worker = True
+                    self.statusbar.showMessage("Finishing pending metadata updates...")
+                    self.metadata_thread.finished.connect(self.close)
+                    self.stopWorkerRequested.emit()
+                event.ignore()
+                return
+
+            # Save window state as Qt's own encoded blobs, keeping other UI settings
+            ui_settings = dict(self.config.get_ui_settings())
+            for key in ('window_size', 'splitter_sizes'):
+                ui_settings.pop(key, None)
+            ui_settings.update({
+                'geometry': self._encode_state(self.saveGeometry()),
+                'state': self._encode_state(self.saveState()),
+                'splitter': self._encode_state(self.splitter.saveState())
             })
-            
-            # Save any pending metadata changes
-            try:
-                self.metadata_manager.save_database()
-            except Exception as save_error:
-                logging.error(f"Error saving metadata during close: {str(save_error)}")
+            self.config.update_setting('ui', ui_settings)
+
+            # Save any pending metadata changes in the background; see wait_for_background_saves.
+            # That save covers pending edits, so the flush timer must not write the file as well
+            self.metadata_manager.cancel_scheduled_flush()
+            self._save_pool.start(_SaveRunnable(self.metadata_manager))
             
             # Clear caches
             try:
@@ -415,25 +620,42 @@ class MainWindow(QMainWindow):
             # Still accept the close event even if there was an error
             event.accept()
 
+    def wait_for_background_saves(self):
+        """Block until metadata saves started on close have finished"""
+        self._save_pool.waitForDone()
+
     def load_window_state(self):
         """Load saved window state from config"""
         try:
             ui_settings = self.config.get_ui_settings()
-            if ui_settings:
-                # Restore window size
+            if 'geometry' in ui_settings:
+                self.restoreGeometry(self._decode_state(ui_settings['geometry']))
+            else:
+                # Layout saved before geometry was stored
                 size = ui_settings.get('window_size', [1200, 800])
                 self.resize(size[0], size[1])
-                
-                # Restore splitter positions
-                splitter_sizes = ui_settings.get('splitter_sizes')
-                if splitter_sizes:
-                    self.splitter.setSizes(splitter_sizes)
+            if 'state' in ui_settings:
+                self.restoreState(self._decode_state(ui_settings['state']))
+            if 'splitter' in ui_settings:
+                self.splitter.restoreState(self._decode_state(ui_settings['splitter']))
+            elif ui_settings.get('splitter_sizes'):
+                self.splitter.setSizes(ui_settings['splitter_sizes'])
                     
         except Exception as e:
             logging.error(f"Error loading window state: {str(e)}")
             # Use default size if loading fails
             self.resize(1200, 800)
 
+    @staticmethod
+    def _encode_state(state: QByteArray) -> str:
+        """Encode a saved Qt state for the JSON config"""
+        return bytes(state.toBase64()).decode('ascii')
+
+    @staticmethod
+    def _decode_state(encoded: str) -> QByteArray:
+        """Decode a Qt state stored by _encode_state"""
+        return QByteArray.fromBase64(encoded.encode('ascii'))
+
     def show_busy_indicator(self, show: bool = True):
         """Show/hide busy cursor"""
         if show:
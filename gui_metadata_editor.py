@@ -1,10 +1,30 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLineEdit, 
                             QComboBox, QTextEdit, QPushButton, QScrollArea,
                             QLabel, QGroupBox, QMessageBox, QFrame)
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, Qt, QSignalBlocker, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
+from contextlib import contextmanager, ExitStack
+from collections import OrderedDict
 import logging
 from datetime import datetime
 import os
+from utils_file_info import format_size
+
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+_FILE_INFO_CACHE_SIZE = 256
+_AUTO_SAVE_DELAY_MS = 1000
+_PROTECTED_CACHE_SIZE = 1024
+
+# Fixed combo box vocabularies
+_DEPARTMENTS = ("", "Electrical", "Civil", "Facility Planning",
+                "Piping", "Mechanical", "Automation", "Project Management")
+_AREAS = ("", "Furnace/Melting", "Lehr/Cooling", "Batch House",
+          "Forming", "Cold End", "Quality Control Lab")
+_DOC_TYPES = ("", "Plan View", "Single Line Diagram", "Elevation View",
+              "Section View", "Equipment Layout")
+_SOURCES = ("", "Internal (CDMG)", "Vendor", "Client")
+_ISSUE_STATUSES = ("", "For Review", "For Bid", "For Construction", "As-Built")
+_WORK_STATUSES = ("", "Not Started", "In Progress", "On Hold", "Complete")
 
 class MetadataEditor(QWidget):
     metadataChanged = pyqtSignal(str, dict)  # file_path, metadata
@@ -14,6 +34,11 @@ class MetadataEditor(QWidget):
         self.safety = safety_manager
         self.current_file = None
         self.has_changes = False
+        self._combo_index = {}  # combo box -> {item text: index}
+        self._file_info_cache = OrderedDict()  # file path -> (mtime_ns, size text, modified text)
+        self._protected_cache = {}  # file path -> is_protected_path result
+        self._protected_version = safety_manager.version  # protected paths the cache reflects
+        self.auto_save = False
         try:
             self.setup_ui()
             self.setup_fields()
@@ -48,12 +73,18 @@ class MetadataEditor(QWidget):
             self.scroll_layout.setContentsMargins(0, 0, 0, 0)
             scroll.setWidget(content_widget)
             main_layout.addWidget(scroll)
+            self.scroll_area = scroll
             
             # Add save button
             self.save_button = QPushButton("Save Metadata")
             self.save_button.clicked.connect(self.save_metadata)
             self.save_button.setEnabled(False)
             main_layout.addWidget(self.save_button)
+
+            # Ctrl+S saves while focus is anywhere in the editor; Qt matches the keys
+            self.save_shortcut = QShortcut(QKeySequence.StandardKey.Save, self)
+            self.save_shortcut.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+            self.save_shortcut.activated.connect(self.handle_save_shortcut)
             
         except Exception as e:
             logging.error(f"Error in setup_ui: {str(e)}")
@@ -91,11 +122,9 @@ class MetadataEditor(QWidget):
             
             self.project_number = QLineEdit()
             self.department = QComboBox()
-            self.department.addItems(["", "Electrical", "Civil", "Facility Planning", 
-                                    "Piping", "Mechanical", "Automation", "Project Management"])
+            self._add_combo_items(self.department, _DEPARTMENTS)
             self.area = QComboBox()
-            self.area.addItems(["", "Furnace/Melting", "Lehr/Cooling", "Batch House", 
-                              "Forming", "Cold End", "Quality Control Lab"])
+            self._add_combo_items(self.area, _AREAS)
             
             project_layout.addRow("Project Number:", self.project_number)
             project_layout.addRow("Department:", self.department)
@@ -108,15 +137,14 @@ class MetadataEditor(QWidget):
             doc_layout = QFormLayout()
             
             self.doc_type = QComboBox()
-            self.doc_type.addItems(["", "Plan View", "Single Line Diagram", "Elevation View", 
-                                  "Section View", "Equipment Layout"])
+            self._add_combo_items(self.doc_type, _DOC_TYPES)
             self.source = QComboBox()
-            self.source.addItems(["", "Internal (CDMG)", "Vendor", "Client"])
+            self._add_combo_items(self.source, _SOURCES)
             self.revision = QLineEdit()
             self.status = QComboBox()
-            self.status.addItems(["", "For Review", "For Bid", "For Construction", "As-Built"])
+            self._add_combo_items(self.status, _ISSUE_STATUSES)
             self.work_status = QComboBox()
-            self.work_status.addItems(["", "Not Started", "In Progress", "On Hold", "Complete"])
+            self._add_combo_items(self.work_status, _WORK_STATUSES)
             
             doc_layout.addRow("Type:", self.doc_type)
             doc_layout.addRow("Source:", self.source)
@@ -152,6 +180,42 @@ class MetadataEditor(QWidget):
             # Add spacer at the bottom
             self.scroll_layout.addStretch()
 
+            # User-editable fields, locked for protected files
+            self._editable_text_inputs = (self.project_number, self.revision, self.codes,
+                                          self.equipment, self.related_docs, self.comments)
+            self._editable_combos = (self.department, self.area, self.doc_type,
+                                     self.source, self.status, self.work_status)
+
+            # Metadata key and widget for every field; drives populate, clear and collect
+            self._fields = (
+                ('file_name', self.file_name),
+                ('file_size', self.file_size),
+                ('file_extension', self.file_type),
+                ('date_added', self.date_added),
+                ('last_modified', self.last_modified),
+                ('project_number', self.project_number),
+                ('department', self.department),
+                ('area', self.area),
+                ('type', self.doc_type),
+                ('source', self.source),
+                ('revision', self.revision),
+                ('issue_status', self.status),
+                ('work_status', self.work_status),
+                ('applicable_codes', self.codes),
+                ('equipment_tags', self.equipment),
+                ('related_documents', self.related_docs),
+                ('comments', self.comments)
+            )
+            self._all_inputs = tuple(widget for _, widget in self._fields)
+            # Split by widget kind once so populate and clear need no type checks
+            self._combo_fields = tuple((key, widget) for key, widget in self._fields
+                                       if isinstance(widget, QComboBox))
+            self._text_fields = tuple((key, widget) for key, widget in self._fields
+                                      if not isinstance(widget, QComboBox))
+            self._field_getters = tuple(
+                (key, self._getter_for(widget)) for key, widget in self._fields
+            )
+
         except Exception as e:
             logging.error(f"Error in setup_fields: {str(e)}")
             raise
@@ -170,29 +234,98 @@ class MetadataEditor(QWidget):
             
             self.comments.textChanged.connect(self.handle_field_change)
             
+            # Auto-save waits for a pause in editing so a burst of edits is saved once
+            self._autosave_timer = QTimer(self)
+            self._autosave_timer.setSingleShot(True)
+            self._autosave_timer.setInterval(_AUTO_SAVE_DELAY_MS)
+            self._autosave_timer.timeout.connect(self.save_metadata)
+            
         except Exception as e:
             logging.error(f"Error connecting signals: {str(e)}")
             raise
 
     def handle_field_change(self):
         """Handle changes to any field"""
-        if self.current_file:
+        if not self.current_file:
+            return
+        if self.auto_save:
+            self._autosave_timer.start()
+        # Only the first edit after a load or save has anything to update
+        if not self.has_changes:
             self.has_changes = True
             self.save_button.setEnabled(True)
 
+    def set_auto_save(self, enabled: bool):
+        """Save automatically shortly after editing stops"""
+        self.auto_save = enabled
+        if not enabled:
+            self._autosave_timer.stop()
+
+    def flush_auto_save(self):
+        """Save now if an auto-save is still waiting"""
+        if self._autosave_timer.isActive():
+            self.save_metadata()
+
+    def _is_protected(self, path: str) -> bool:
+        """Cached safety.is_protected_path for files shown in the editor"""
+        if self._protected_version != self.safety.version:
+            self.clear_protected_cache()
+        protected = self._protected_cache.get(path)
+        if protected is None:
+            protected = self.safety.is_protected_path(path)
+            if len(self._protected_cache) >= _PROTECTED_CACHE_SIZE:
+                self._protected_cache.clear()
+            self._protected_cache[path] = protected
+        return protected
+
+    def clear_protected_cache(self):
+        """Forget cached protection results, e.g. after the protected paths change"""
+        self._protected_cache.clear()
+        self._protected_version = self.safety.version
+
+    @staticmethod
+    def _getter_for(widget):
+        """Bound method that reads a field widget's value as text"""
+        if isinstance(widget, QComboBox):
+            return widget.currentText
+        if isinstance(widget, QTextEdit):
+            return widget.toPlainText
+        return widget.text
+
+    def _add_combo_items(self, combo: QComboBox, items: tuple):
+        """Fill a combo box and index its items by text"""
+        combo.addItems(list(items))
+        self._combo_index[combo] = {text: i for i, text in enumerate(items)}
+
+    def _set_combo_text(self, combo: QComboBox, text: str):
+        """Select an item by text with a dict lookup; unknown text selects the blank entry"""
+        combo.setCurrentIndex(self._combo_index[combo].get(text, 0))
+
+    @contextmanager
+    def _batched_update(self):
+        """Suspend repaints and input signals while many fields change"""
+        was_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        try:
+            with ExitStack() as stack:
+                for widget in self._all_inputs:
+                    stack.enter_context(QSignalBlocker(widget))
+                yield
+        finally:
+            self.setUpdatesEnabled(was_enabled)
+
     def load_file_metadata(self, file_path: str, metadata: dict = None):
         """Load metadata for selected file"""
         try:
+            # Edits still waiting on auto-save belong to the previous file
+            self.flush_auto_save()
             self.current_file = file_path
             self.has_changes = False
             self.title_label.setText(f"Metadata: {os.path.basename(file_path)}")
             self.path_label.setText(file_path)
             
             # Check if file is in protected path
-            if self.safety.is_protected_path(file_path):
-                self.set_read_only_mode(True)
-            else:
-                self.set_read_only_mode(False)
+            self.set_read_only_mode(self._is_protected(file_path))
             
             if metadata:
                 self.populate_fields(metadata)
@@ -209,48 +342,35 @@ class MetadataEditor(QWidget):
         """Populate basic file information"""
         try:
             stats = os.stat(file_path)
+            # Reuse the formatted size and date while the file is unchanged
+            cached = self._file_info_cache.get(file_path)
+            if cached is not None and cached[0] == stats.st_mtime_ns:
+                self._file_info_cache.move_to_end(file_path)
+            else:
+                cached = (stats.st_mtime_ns, self.format_size(stats.st_size),
+                          datetime.fromtimestamp(stats.st_mtime).strftime(_DATE_FORMAT))
+                self._file_info_cache[file_path] = cached
+                if len(self._file_info_cache) > _FILE_INFO_CACHE_SIZE:
+                    self._file_info_cache.popitem(last=False)
+
             self.file_name.setText(os.path.basename(file_path))
-            self.file_size.setText(self.format_size(stats.st_size))
+            self.file_size.setText(cached[1])
             self.file_type.setText(os.path.splitext(file_path)[1])
-            self.date_added.setText(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            self.last_modified.setText(
-                datetime.fromtimestamp(stats.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-            )
+            self.date_added.setText(datetime.now().strftime(_DATE_FORMAT))
+            self.last_modified.setText(cached[2])
         except Exception as e:
             logging.error(f"Error populating file info: {str(e)}")
 
     def populate_fields(self, metadata: dict):
         """Fill form fields with metadata"""
         try:
-            # File information
-            self.file_name.setText(metadata.get('file_name', ''))
-            self.file_size.setText(metadata.get('file_size', ''))
-            self.file_type.setText(metadata.get('file_extension', ''))
-            self.date_added.setText(str(metadata.get('date_added', '')))
-            self.last_modified.setText(str(metadata.get('last_modified', '')))
-            
-            # Project information
-            self.project_number.setText(metadata.get('project_number', ''))
-            self.department.setCurrentText(metadata.get('department', ''))
-            self.area.setCurrentText(metadata.get('area', ''))
-            
-            # Document properties
-            self.doc_type.setCurrentText(metadata.get('type', ''))
-            self.source.setCurrentText(metadata.get('source', ''))
-            self.revision.setText(metadata.get('revision', ''))
-            self.status.setCurrentText(metadata.get('issue_status', ''))
-            self.work_status.setCurrentText(metadata.get('work_status', ''))
-            
-            # Technical reference
-            self.codes.setText(metadata.get('applicable_codes', ''))
-            self.equipment.setText(metadata.get('equipment_tags', ''))
-            self.related_docs.setText(metadata.get('related_documents', ''))
-            
-            # Comments
-            self.comments.setText(metadata.get('comments', ''))
-            
-            self.save_button.setEnabled(False)
-            self.has_changes = False
+            with self._batched_update():
+                for key, widget in self._text_fields:
+                    widget.setText(str(metadata.get(key, '')))
+                for key, widget in self._combo_fields:
+                    self._set_combo_text(widget, metadata.get(key, ''))
+                self.save_button.setEnabled(False)
+                self.has_changes = False
             
         except Exception as e:
             logging.error(f"Error populating fields: {str(e)}")
@@ -259,35 +379,13 @@ class MetadataEditor(QWidget):
     def clear_fields(self):
         """Clear all form fields"""
         try:
-            # Clear file information
-            self.file_name.clear()
-            self.file_size.clear()
-            self.file_type.clear()
-            self.date_added.clear()
-            self.last_modified.clear()
-            
-            # Clear project information
-            self.project_number.clear()
-            self.department.setCurrentIndex(0)
-            self.area.setCurrentIndex(0)
-            
-            # Clear document properties
-            self.doc_type.setCurrentIndex(0)
-            self.source.setCurrentIndex(0)
-            self.revision.clear()
-            self.status.setCurrentIndex(0)
-            self.work_status.setCurrentIndex(0)
-            
-            # Clear technical reference
-            self.codes.clear()
-            self.equipment.clear()
-            self.related_docs.clear()
-            
-            # Clear comments
-            self.comments.clear()
-            
-            self.save_button.setEnabled(False)
-            self.has_changes = False
+            with self._batched_update():
+                for _, widget in self._text_fields:
+                    widget.clear()
+                for _, widget in self._combo_fields:
+                    widget.setCurrentIndex(0)
+                self.save_button.setEnabled(False)
+                self.has_changes = False
             
         except Exception as e:
             logging.error(f"Error clearing fields: {str(e)}")
@@ -296,17 +394,13 @@ class MetadataEditor(QWidget):
     def set_read_only_mode(self, read_only: bool):
         """Set read-only mode for all fields"""
         try:
-            for widget in [self.project_number, self.revision, self.codes,
-                         self.equipment, self.related_docs, self.comments]:
-                if isinstance(widget, QLineEdit):
-                    widget.setReadOnly(read_only)
-                elif isinstance(widget, QTextEdit):
-                    widget.setReadOnly(read_only)
-            
-            for widget in [self.department, self.area, self.doc_type,
-                         self.source, self.status, self.work_status]:
+            # Read-only text can still be selected and copied
+            for widget in self._editable_text_inputs:
+                widget.setReadOnly(read_only)
+
+            for widget in self._editable_combos:
                 widget.setEnabled(not read_only)
-            
+
             self.save_button.setEnabled(not read_only and self.has_changes)
             
         except Exception as e:
@@ -315,36 +409,12 @@ class MetadataEditor(QWidget):
 
     def save_metadata(self):
         """Save current metadata"""
+        self._autosave_timer.stop()
         if not self.current_file:
             return
             
         try:
-            metadata = {
-                'file_path': self.current_file,
-                'file_name': self.file_name.text(),
-                'file_location': os.path.dirname(self.current_file),
-                'file_extension': self.file_type.text(),
-                'file_size': self.file_size.text(),
-                'date_added': self.date_added.text(),
-                'last_modified': datetime.now(),
-                
-                'project_number': self.project_number.text(),
-                'department': self.department.currentText(),
-                'area': self.area.currentText(),
-                
-                'type': self.doc_type.currentText(),
-                'source': self.source.currentText(),
-                'revision': self.revision.text(),
-                'issue_status': self.status.currentText(),
-                'work_status': self.work_status.currentText(),
-                
-                'applicable_codes': self.codes.text(),
-                'equipment_tags': self.equipment.text(),
-                'related_documents': self.related_docs.text(),
-                
-                'comments': self.comments.toPlainText()
-            }
-            
+            metadata = self._collect_metadata()
             self.metadataChanged.emit(self.current_file, metadata)
             self.save_button.setEnabled(False)
             self.has_changes = False
@@ -353,6 +423,14 @@ class MetadataEditor(QWidget):
             logging.error(f"Error saving metadata: {str(e)}")
             self.show_error_message("Error", f"Failed to save metadata: {str(e)}")
 
+    def _collect_metadata(self) -> dict:
+        """Read the current field values into a metadata dict"""
+        metadata = {key: getter() for key, getter in self._field_getters}
+        metadata['file_path'] = self.current_file
+        metadata['file_location'] = os.path.dirname(self.current_file)
+        metadata['last_modified'] = datetime.now()
+        return metadata
+
     def has_unsaved_changes(self) -> bool:
         """Check if there are unsaved changes"""
         return self.has_changes
@@ -364,11 +442,7 @@ class MetadataEditor(QWidget):
     @staticmethod
     def format_size(size: int) -> str:
         """Format file size for display"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} TB"
+        return format_size(size)
 
     def resizeEvent(self, event):
         """Handle resize events"""
@@ -380,10 +454,9 @@ class MetadataEditor(QWidget):
         """Adjust scroll area dimensions"""
         try:
             # Ensure proper scroll area sizing
-            scroll_widget = self.findChild(QScrollArea)
-            if scroll_widget:
-                available_height = self.height() - self.title_section.height() - self.save_button.height() - 20
-                scroll_widget.setMinimumHeight(available_height)
+            available_height = self.height() - self.title_section.height() - self.save_button.height() - 20
+            if available_height != self.scroll_area.minimumHeight():
+                self.scroll_area.setMinimumHeight(available_height)
         except Exception as e:
             logging.error(f"Error adjusting scroll area: {str(e)}")
 
@@ -392,19 +465,11 @@ class MetadataEditor(QWidget):
         super().showEvent(event)
         self.adjustScrollArea()
         
-    def keyPressEvent(self, event):
-        """Handle key press events"""
-        try:
-            # Ctrl+S to save
-            if event.modifiers() & Qt.ControlModifier and event.key() == Qt.Key_S:
-                if self.save_button.isEnabled():
-                    self.save_metadata()
-            else:
-                super().keyPressEvent(event)
-        except Exception as e:
-            logging.error(f"Error handling key press: {str(e)}")
-            super().keyPressEvent(event)
-            
+    def handle_save_shortcut(self):
+        """Save on Ctrl+S when there is something to save"""
+        if self.save_button.isEnabled():
+            self.save_metadata()
+
     def validate_input(self) -> bool:
         """Validate input fields"""
         try:
@@ -425,7 +490,8 @@ class MetadataEditor(QWidget):
     def update_file_info(self):
         """Update file information display"""
         try:
-            if self.current_file and os.path.exists(self.current_file):
+            # populate_file_info stats the file itself and logs if it is gone
+            if self.current_file:
                 self.populate_file_info(self.current_file)
         except Exception as e:
             logging.error(f"Error updating file info: {str(e)}")
@@ -436,31 +502,7 @@ class MetadataEditor(QWidget):
             if not self.current_file:
                 return {}
                 
-            return {
-                'file_path': self.current_file,
-                'file_name': self.file_name.text(),
-                'file_location': os.path.dirname(self.current_file),
-                'file_extension': self.file_type.text(),
-                'file_size': self.file_size.text(),
-                'date_added': self.date_added.text(),
-                'last_modified': datetime.now(),
-                
-                'project_number': self.project_number.text(),
-                'department': self.department.currentText(),
-                'area': self.area.currentText(),
-                
-                'type': self.doc_type.currentText(),
-                'source': self.source.currentText(),
-                'revision': self.revision.text(),
-                'issue_status': self.status.currentText(),
-                'work_status': self.work_status.currentText(),
-                
-                'applicable_codes': self.codes.text(),
-                'equipment_tags': self.equipment.text(),
-                'related_documents': self.related_docs.text(),
-                
-                'comments': self.comments.toPlainText()
-            }
+            return self._collect_metadata()
         except Exception as e:
             logging.error(f"Error getting current metadata: {str(e)}")
             return {}
@@ -468,6 +510,8 @@ class MetadataEditor(QWidget):
     def closeEvent(self, event):
         """Handle editor close event"""
         try:
+            # Edits waiting on auto-save are saved without asking
+            self.flush_auto_save()
             if self.has_unsaved_changes():
                 reply = QMessageBox.question(
                     self, "Unsaved Changes",
@@ -1,14 +1,51 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                             QComboBox, QPushButton, QLabel, QFrame)
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, Qt, QTimer, QSignalBlocker
 import logging
 
+# Filter choices; the first entry of each matches everything
+_TYPE_FILTERS = (
+    "All Types",
+    "Plan View",
+    "Single Line Diagram",
+    "Elevation View",
+    "Section View",
+    "Equipment Layout",
+    "Cable Tray Layout",
+    "Conduit Layout",
+    "Piping Layout",
+    "Foundation Plan",
+    "Structural Details"
+)
+_DEPARTMENT_FILTERS = (
+    "All Departments",
+    "Electrical",
+    "Civil",
+    "Facility Planning",
+    "Piping",
+    "Mechanical",
+    "Automation",
+    "Project Management"
+)
+_STATUS_FILTERS = (
+    "All Status",
+    "For Review",
+    "For Bid",
+    "For Construction",
+    "As-Built",
+    "Not Started",
+    "In Progress",
+    "On Hold",
+    "Complete"
+)
+
 class SearchPanel(QWidget):
     searchRequested = pyqtSignal(str)
     filterChanged = pyqtSignal(dict)
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._last_filters = None
         self.setup_ui()
         self.connect_signals()
         self.load_initial_filters()
@@ -46,19 +83,7 @@ class SearchPanel(QWidget):
             type_label = QLabel("Type:")
             type_label.setMinimumWidth(40)
             self.type_filter = QComboBox()
-            self.type_filter.addItems([
-                "All Types",
-                "Plan View",
-                "Single Line Diagram",
-                "Elevation View",
-                "Section View",
-                "Equipment Layout",
-                "Cable Tray Layout",
-                "Conduit Layout",
-                "Piping Layout",
-                "Foundation Plan",
-                "Structural Details"
-            ])
+            self.type_filter.addItems(list(_TYPE_FILTERS))
             type_layout.addWidget(type_label)
             type_layout.addWidget(self.type_filter)
             
@@ -67,16 +92,7 @@ class SearchPanel(QWidget):
             dept_label = QLabel("Department:")
             dept_label.setMinimumWidth(80)
             self.dept_filter = QComboBox()
-            self.dept_filter.addItems([
-                "All Departments",
-                "Electrical",
-                "Civil",
-                "Facility Planning",
-                "Piping",
-                "Mechanical",
-                "Automation",
-                "Project Management"
-            ])
+            self.dept_filter.addItems(list(_DEPARTMENT_FILTERS))
             dept_layout.addWidget(dept_label)
             dept_layout.addWidget(self.dept_filter)
             
@@ -85,20 +101,16 @@ class SearchPanel(QWidget):
             status_label = QLabel("Status:")
             status_label.setMinimumWidth(50)
             self.status_filter = QComboBox()
-            self.status_filter.addItems([
-                "All Status",
-                "For Review",
-                "For Bid",
-                "For Construction",
-                "As-Built",
-                "Not Started",
-                "In Progress",
-                "On Hold",
-                "Complete"
-            ])
+            self.status_filter.addItems(list(_STATUS_FILTERS))
             status_layout.addWidget(status_label)
             status_layout.addWidget(self.status_filter)
             
+            # Index each filter's items by text for set_filters
+            self._filter_index = {
+                combo: {combo.itemText(i): i for i in range(combo.count())}
+                for combo in (self.type_filter, self.dept_filter, self.status_filter)
+            }
+            
             # Add filter layouts to main filter layout
             filter_layout.addLayout(type_layout)
             filter_layout.addLayout(dept_layout)
@@ -132,10 +144,14 @@ class SearchPanel(QWidget):
             self.search_button.clicked.connect(self.execute_search)
             self.search_input.returnPressed.connect(self.execute_search)
             
-            # Filter signals
-            self.type_filter.currentTextChanged.connect(self.handle_filter_change)
-            self.dept_filter.currentTextChanged.connect(self.handle_filter_change)
-            self.status_filter.currentTextChanged.connect(self.handle_filter_change)
+            # Filter signals, coalesced so quick successive changes emit once
+            self._filter_timer = QTimer(self)
+            self._filter_timer.setSingleShot(True)
+            self._filter_timer.setInterval(50)
+            self._filter_timer.timeout.connect(self.handle_filter_change)
+            self.type_filter.currentTextChanged.connect(self.schedule_filter_change)
+            self.dept_filter.currentTextChanged.connect(self.schedule_filter_change)
+            self.status_filter.currentTextChanged.connect(self.schedule_filter_change)
             
             # Reset button
             self.reset_button.clicked.connect(self.reset_filters)
@@ -158,18 +174,28 @@ class SearchPanel(QWidget):
             search_text = self.search_input.text().strip()
             if search_text:
                 self.searchRequested.emit(search_text)
-                self.handle_filter_change()  # Also apply current filters
+                self.handle_filter_change(force=True)  # Also apply current filters
         except Exception as e:
             logging.error(f"Error executing search: {str(e)}")
 
-    def handle_filter_change(self):
+    def schedule_filter_change(self):
+        """Emit filters shortly, once for a burst of changes"""
+        self._filter_timer.start()
+
+    def handle_filter_change(self, force: bool = False):
         """Handle changes to any filter"""
         try:
+            # Emitting now covers any change still waiting on the timer
+            self._filter_timer.stop()
             filters = {
                 'type': self.type_filter.currentText(),
                 'department': self.dept_filter.currentText(),
                 'status': self.status_filter.currentText()
             }
+            # Changes that end where they started need no new filtering
+            if filters == self._last_filters and not force:
+                return
+            self._last_filters = filters
             self.filterChanged.emit(filters)
         except Exception as e:
             logging.error(f"Error handling filter change: {str(e)}")
@@ -178,9 +204,11 @@ class SearchPanel(QWidget):
         """Reset all filters to default values"""
         try:
             self.search_input.clear()
-            self.type_filter.setCurrentText("All Types")
-            self.dept_filter.setCurrentText("All Departments")
-            self.status_filter.setCurrentText("All Status")
+            # Silence the combos so the reset emits one filter change, not three
+            for combo in (self.type_filter, self.dept_filter, self.status_filter):
+                with QSignalBlocker(combo):
+                    # The "All ..." entry is first in every filter
+                    combo.setCurrentIndex(0)
             
             # Emit filter change event with reset values
             self.handle_filter_change()
@@ -201,12 +229,13 @@ class SearchPanel(QWidget):
         try:
             if 'search_text' in filters:
                 self.search_input.setText(filters['search_text'])
-            if 'type' in filters:
-                self.type_filter.setCurrentText(filters['type'])
-            if 'department' in filters:
-                self.dept_filter.setCurrentText(filters['department'])
-            if 'status' in filters:
-                self.status_filter.setCurrentText(filters['status'])
+            for key, combo in (('type', self.type_filter), ('department', self.dept_filter),
+                               ('status', self.status_filter)):
+                # Unknown values leave the filter as it is, like setCurrentText did
+                index = self._filter_index[combo].get(filters.get(key))
+                if index is not None:
+                    with QSignalBlocker(combo):
+                        combo.setCurrentIndex(index)
             
             self.handle_filter_change()
         except Exception as e:
@@ -4,10 +4,18 @@ import os
 from PyQt6.QtWidgets import QApplication
 from gui_main_window import MainWindow
 from utils_path_manager import PathManager
-from utils_metadata_manager import MetadataManager
 from utils_access_safety import AccessSafety
+from utils_logging import add_file_log
 from config import Config
 
+# Component loggers that also keep their own log file: name -> (file, level)
+_COMPONENT_LOGS = {
+    'metadata': ('metadata_operations.log', logging.INFO),
+    'access_safety': ('access_safety.log', logging.WARNING),
+    'file_operations': ('file_operations.log', logging.INFO),
+    'path_manager': ('path_operations.log', logging.INFO)
+}
+
 def setup_logging():
     """Configure application logging"""
     logging.basicConfig(
@@ -15,6 +23,8 @@ def setup_logging():
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    for name, (filename, level) in _COMPONENT_LOGS.items():
+        add_file_log(name, filename, level)
 
 def check_dependencies():
     """Verify all required dependencies are available"""
@@ -30,38 +40,28 @@ def check_dependencies():
     if missing_packages:
         raise ImportError(f"Missing required packages: {', '.join(missing_packages)}")
 
-def initialize_safety(config):
+def initialize_safety(network_paths):
     """Initialize access safety controls"""
     safety = AccessSafety()
-    protected_paths = [
-        config['network_paths']['root'],
-        config['network_paths']['projects'],
-        config['network_paths']['templates']
-    ]
-    safety.set_protected_paths(protected_paths)
+    safety.set_protected_paths([
+        network_paths[key] for key in ('root', 'projects', 'templates')
+    ])
     return safety
 
 def initialize_application():
     """Initialize core application components"""
     config = Config()  # Create Config instance directly
     
+    network_paths = config.get_network_paths()
+    
     # Initialize path manager
     path_manager = PathManager()
-    path_manager.verify_network_paths(config.get_network_paths())
+    path_manager.verify_network_paths(network_paths)
     
     # Initialize safety system
-    safety = AccessSafety()
-    protected_paths = [
-        config.get_network_paths()['root'],
-        config.get_network_paths()['projects'],
-        config.get_network_paths()['templates']
-    ]
-    safety.set_protected_paths(protected_paths)
+    safety = initialize_safety(network_paths)
     
-    # Initialize metadata
-    metadata_path = os.path.join("local_metadata", "metadata.xlsx")
-    os.makedirs("local_metadata", exist_ok=True)
-    metadata_manager = MetadataManager(safety, metadata_path)
+    # Metadata storage is opened by MainWindow, which owns the metadata manager
     
     return config, safety
 
@@ -82,6 +82,8 @@ def main():
         # Create and show main window
         window = MainWindow(config, safety)  # Pass safety to MainWindow
         window.show()
+        # The window hides at once on close; keep the process alive until its save is written
+        app.aboutToQuit.connect(window.wait_for_background_saves)
         
         # Start event loop
         sys.exit(app.exec())
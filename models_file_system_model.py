@@ -1,14 +1,40 @@
 from PyQt6.QtCore import QAbstractItemModel, Qt, QModelIndex
 import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Iterator, Optional, Tuple
+from utils_file_info import file_extension
+
+_FETCH_BATCH_SIZE = 200
+# Fields stored for every entry, one list per field. Full paths are not stored;
+# 'parent' refers to one shared string per scanned folder
+_COLUMNS = ('name', 'parent', 'is_dir', 'size', 'modified', 'type', 'status')
+# Descriptions for known extensions; others show the bare extension
+_FILE_TYPES = {
+    '.dwg': 'AutoCAD Drawing',
+    '.pdf': 'PDF Document',
+    '.doc': 'Word Document',
+    '.docx': 'Word Document',
+    '.xls': 'Excel Spreadsheet',
+    '.xlsx': 'Excel Spreadsheet',
+    '.rvt': 'Revit File',
+}
 
 class FileSystemModel(QAbstractItemModel):
-    def __init__(self):
+    def __init__(self, enable_parallel_scan: bool = False, max_workers: int = 8,
+                 metadata_model=None):
         super().__init__()
+        self.metadata_model = metadata_model  # source of file statuses, if any
+        # Overlapping scandir round-trips helps on network shares but can slow local disks
+        self.enable_parallel_scan = enable_parallel_scan
+        self.max_workers = max_workers
         self.root_path = ""
-        self.files_data = []
+        self._cols = self._empty_columns()  # field -> list of values, one per row
+        self._scan_iter: Optional[Iterator[Dict]] = None  # entries not yet fetched
         self.headers = ["Name", "Type", "Modified", "Size", "Status"]
+        self._header_keys = [header.lower() for header in self.headers]
         
     def setup_model(self, root_path: str):
         """Initialize model with root path"""
@@ -18,66 +44,167 @@ class FileSystemModel(QAbstractItemModel):
     def refresh(self):
         """Reload file system data"""
         self.beginResetModel()
-        self.files_data = self.scan_directory(self.root_path)
+        self._close_scan()
+        self._cols = self._empty_columns()
+        # Rows are scanned as the view asks for them through fetchMore
+        self._scan_iter = self._iter_entries(self.root_path)
         self.endResetModel()
 
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._scan_iter is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._scan_iter is None:
+            return
+        try:
+            rows = list(islice(self._scan_iter, _FETCH_BATCH_SIZE))
+        except Exception as e:
+            logging.error(f"Error scanning {self.root_path}: {str(e)}")
+            rows = []
+        if len(rows) < _FETCH_BATCH_SIZE:
+            self._close_scan()
+        if rows:
+            # One metadata lookup for the whole batch rather than one per entry
+            statuses = self.get_file_statuses([row['path'] for row in rows])
+            for row, status in zip(rows, statuses):
+                row['status'] = status
+            self._append_rows(rows)
+
+    def _fetch_all(self):
+        """Load every remaining entry, for operations that need the whole list"""
+        while self._scan_iter is not None:
+            self.fetchMore()
+
+    def _close_scan(self):
+        """Stop any scan still in progress"""
+        if self._scan_iter is not None:
+            self._scan_iter.close()
+            self._scan_iter = None
+
+    def _append_rows(self, rows: List[Dict]):
+        """Append scanned entries to the end of the model"""
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for key, values in self._cols.items():
+            values.extend(row[key] for row in rows)
+        self.endInsertRows()
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, list]:
+        """One empty value list per stored field"""
+        return {key: [] for key in _COLUMNS}
+
+    def _take_rows(self, rows: List[int]):
+        """Keep only the given rows, in the given order, across every column"""
+        self._cols = {key: [values[i] for i in rows] for key, values in self._cols.items()}
+
     def scan_directory(self, path: str) -> List[Dict]:
         """Recursively scan directory for files"""
-        files = []
-        for entry in os.scandir(path):
-            file_info = {
-                'name': entry.name,
-                'path': entry.path,
-                'is_dir': entry.is_dir(),
-                'size': entry.stat().st_size if entry.is_file() else 0,
-                'modified': datetime.fromtimestamp(entry.stat().st_mtime),
-                'type': self.get_file_type(entry.name) if entry.is_file() else 'Folder',
-                'status': self.get_file_status(entry.path)
-            }
-            files.append(file_info)
-            
-            if entry.is_dir():
-                files.extend(self.scan_directory(entry.path))
-        return files
-
-    def get_file_type(self, filename: str) -> str:
+        return list(self._iter_entries(path))
+
+    def _iter_entries(self, root: str) -> Iterator[Dict]:
+        """Yield file info for everything under root, one directory at a time"""
+        if self.enable_parallel_scan:
+            yield from self._iter_entries_parallel(root)
+            return
+        stack = [root]
+        while stack:
+            infos, subdirs = self._scan_folder(stack.pop())
+            stack.extend(subdirs)
+            yield from infos
+
+    def _iter_entries_parallel(self, root: str) -> Iterator[Dict]:
+        """Scan folders on a thread pool, yielding each folder's entries as it finishes"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._scan_folder, root)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    infos, subdirs = future.result()
+                    pending.update(pool.submit(self._scan_folder, path) for path in subdirs)
+                    yield from infos
+
+    def _scan_folder(self, path: str) -> Tuple[List[Dict], List[str]]:
+        """File info for one folder's entries, plus the subfolders to scan next"""
+        infos = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # One stat per entry; the type comes from the directory listing
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        stats = entry.stat(follow_symlinks=False)
+                    except OSError as e:
+                        logging.error(f"Error reading {entry.path}: {str(e)}")
+                        continue
+                    if is_dir:
+                        subdirs.append(entry.path)
+                    infos.append({
+                        'name': entry.name,
+                        'parent': path,
+                        'path': entry.path,
+                        'is_dir': is_dir,
+                        'size': 0 if is_dir else stats.st_size,
+                        'modified': datetime.fromtimestamp(stats.st_mtime),
+                        'type': 'Folder' if is_dir else self.get_file_type(entry.name),
+                        'status': None  # filled in per fetched batch
+                    })
+        except OSError as e:
+            # An unreadable folder is skipped, keeping anything already listed,
+            # rather than ending the whole scan
+            logging.error(f"Error scanning {path}: {str(e)}")
+        return infos, subdirs
+
+    @staticmethod
+    def get_file_type(filename: str) -> str:
         """Determine file type from extension"""
-        ext = os.path.splitext(filename)[1].lower()
-        types = {
-            '.dwg': 'AutoCAD Drawing',
-            '.pdf': 'PDF Document',
-            '.doc': 'Word Document',
-            '.docx': 'Word Document',
-            '.xls': 'Excel Spreadsheet',
-            '.xlsx': 'Excel Spreadsheet',
-            '.rvt': 'Revit File',
-        }
-        return types.get(ext, ext[1:] if ext else 'Unknown')
+        ext = file_extension(filename).lower()
+        if not ext:
+            return 'Unknown'
+        return _FILE_TYPES.get(ext, ext[1:])
+
+    def file_path(self, row: int) -> str:
+        """Full path of the entry in a row"""
+        return os.path.join(self._cols['parent'][row], self._cols['name'][row])
 
     def get_file_status(self, file_path: str) -> str:
         """Get file status from metadata"""
-        # Implement metadata lookup
-        return "Unknown"
+        return self.get_file_statuses([file_path])[0]
+
+    def get_file_statuses(self, file_paths: List[str]) -> List[str]:
+        """Get file statuses from metadata for many files at once"""
+        if self.metadata_model is None:
+            return ["Unknown"] * len(file_paths)
+        return self.metadata_model.get_statuses_batch(file_paths)
 
     def filter_files(self, filters: Dict) -> None:
         """Apply filters to file list"""
+        self._fetch_all()
         self.beginResetModel()
-        filtered_data = self.files_data.copy()
+        rows = range(self.rowCount())
         
         for key, value in filters.items():
             if value and value != "All":
-                filtered_data = [f for f in filtered_data 
-                               if str(f.get(key)).lower() == value.lower()]
+                value = value.lower()
+                if key == 'path':
+                    column = [self.file_path(i) for i in range(self.rowCount())]
+                else:
+                    column = self._cols.get(key)
+                rows = [i for i in rows
+                        if str(column[i] if column is not None else None).lower() == value]
         
-        self.files_data = filtered_data
+        self._take_rows(list(rows))
         self.endResetModel()
 
     def sort_files(self, column: int, order: Qt.SortOrder) -> None:
         """Sort file list by column"""
+        self._fetch_all()
         self.beginResetModel()
-        key = self.headers[column].lower()
+        values = self._cols[self._header_keys[column]]
         reverse = order == Qt.SortOrder.DescendingOrder
-        self.files_data.sort(key=lambda x: x.get(key, ''), reverse=reverse)
+        # Sort row numbers once, then reorder every column to match
+        self._take_rows(sorted(range(len(values)), key=values.__getitem__, reverse=reverse))
         self.endResetModel()
 
     # Required QAbstractItemModel implementations
@@ -90,7 +217,7 @@ class FileSystemModel(QAbstractItemModel):
         return QModelIndex()
 
     def rowCount(self, parent=QModelIndex()) -> int:
-        return len(self.files_data)
+        return len(self._cols['name'])
 
     def columnCount(self, parent=QModelIndex()) -> int:
         return len(self.headers)
@@ -100,9 +227,7 @@ class FileSystemModel(QAbstractItemModel):
             return None
 
         if role == Qt.ItemDataRole.DisplayRole:
-            file = self.files_data[index.row()]
-            column = self.headers[index.column()].lower()
-            return str(file.get(column, ''))
+            return str(self._cols[self._header_keys[index.column()]][index.row()])
 
         return None
 
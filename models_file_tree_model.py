@@ -0,0 +1,247 @@
+from PyQt6.QtCore import QAbstractItemModel, Qt, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+import os
+from datetime import datetime
+from typing import List, Optional
+from utils_file_info import file_extension, format_size
+
+_DATE_CACHE_SIZE = 4096
+_date_cache = {}  # minute since epoch -> formatted date
+
+
+def _format_date(timestamp) -> str:
+    """Format date for display"""
+    # Display resolution is one minute, so files in the same minute share a string
+    minute = int(timestamp) // 60
+    formatted = _date_cache.get(minute)
+    if formatted is None:
+        formatted = datetime.fromtimestamp(minute * 60).strftime('%Y-%m-%d %H:%M')
+        if len(_date_cache) >= _DATE_CACHE_SIZE:
+            _date_cache.pop(next(iter(_date_cache)))
+        _date_cache[minute] = formatted
+    return formatted
+
+
+class FileNode:
+    """One row of the file tree; display strings are produced on demand"""
+    __slots__ = ('path', 'name', 'is_file', 'mtime', 'size', 'protected',
+                 'parent', 'children', 'row')
+
+    def __init__(self, path: str, name: str, is_file: bool, mtime: Optional[float] = None,
+                 size: Optional[int] = None, protected: bool = False):
+        self.path = path
+        self.name = name
+        self.is_file = is_file
+        self.mtime = mtime
+        self.size = size
+        self.protected = protected
+        self.parent = None
+        self.children = None  # None until a folder's contents are loaded
+        self.row = 0
+
+    @property
+    def extension(self) -> str:
+        return file_extension(self.name)
+
+
+class FileTreeModel(QAbstractItemModel):
+    fetchRequested = pyqtSignal(object)  # FileNode whose children are needed
+
+    HEADERS = ['Name', 'Type', 'Modified', 'Size', 'Status']
+    PATH_ROLE = Qt.ItemDataRole.UserRole
+    STAT_ROLE = Qt.ItemDataRole.UserRole + 1
+    IS_FILE_ROLE = Qt.ItemDataRole.UserRole + 2
+
+    # Sort keys per column; folders sort ahead of files where values are missing
+    _SORT_KEYS = (
+        lambda n: n.name.lower(),
+        lambda n: (n.is_file, n.extension.lower()),
+        lambda n: (n.is_file, n.mtime or 0),
+        lambda n: (n.is_file, n.size or 0),
+        lambda n: n.protected,
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = FileNode("", "", False)
+        self.root.children = []
+        self.protected_color = QColor(128, 128, 128)
+        self.rebuild_fonts()
+        self._fetching = set()
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def rebuild_fonts(self):
+        """Create the shared font used for read-only items"""
+        self.protected_font = QFont()
+        self.protected_font.setItalic(True)
+
+    def set_root(self, root_path: str) -> FileNode:
+        """Replace the tree with an empty root for root_path"""
+        self.beginResetModel()
+        self.root = FileNode(root_path, os.path.basename(root_path), False)
+        self.root.children = []
+        self._fetching.clear()
+        self.endResetModel()
+        return self.root
+
+    def node_from_index(self, index: QModelIndex) -> FileNode:
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index_for_node(self, node: FileNode, column: int = 0) -> QModelIndex:
+        if node is self.root or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def add_children(self, parent_node: FileNode, nodes: List[FileNode]) -> None:
+        """Append nodes under parent_node with a single insert notification"""
+        if parent_node.children is None:
+            parent_node.children = []
+        if not nodes:
+            return
+
+        first = len(parent_node.children)
+        self.beginInsertRows(self.index_for_node(parent_node), first, first + len(nodes) - 1)
+        for row, node in enumerate(nodes, first):
+            node.parent = parent_node
+            node.row = row
+        parent_node.children.extend(nodes)
+        self.endInsertRows()
+
+        if self._sort_column is not None:
+            self._sort_nodes([parent_node])
+
+    def finish_fetch(self, node: FileNode) -> None:
+        """Mark a folder as loaded, even if it turned out to be empty"""
+        self._fetching.discard(node.path)
+        if node.children is None:
+            node.children = []
+
+    def remove_child(self, parent_node: FileNode, row: int) -> FileNode:
+        """Remove and return the child at row"""
+        self.beginRemoveRows(self.index_for_node(parent_node), row, row)
+        node = parent_node.children.pop(row)
+        for sibling in parent_node.children[row:]:
+            sibling.row -= 1
+        node.parent = None
+        self.endRemoveRows()
+        return node
+
+    def update_stats(self, node: FileNode, mtime: float, size: int) -> None:
+        """Update a file's modified time and size"""
+        if (node.mtime, node.size) == (mtime, size):
+            return
+        node.mtime = mtime
+        node.size = size
+        self.dataChanged.emit(self.index_for_node(node, 2), self.index_for_node(node, 3))
+
+    # Required QAbstractItemModel implementations
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self.node_from_index(parent).children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_for_node(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self.node_from_index(parent).children
+        return len(children) if children else 0
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        node = self.node_from_index(parent)
+        if node.is_file or parent.column() > 0:
+            return False
+        # Unloaded folders stay expandable until their contents are known
+        return node.children is None or len(node.children) > 0
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self.node_from_index(parent)
+        return (not node.is_file and node.children is None
+                and node.path not in self._fetching)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self.node_from_index(parent)
+        if self.canFetchMore(parent):
+            self._fetching.add(node.path)
+            self.fetchRequested.emit(node)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        node = index.internalPointer()
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return node.name
+            if column == 1:
+                return node.extension if node.is_file else "Folder"
+            if column == 2:
+                return _format_date(node.mtime) if node.is_file else ""
+            if column == 3:
+                return format_size(node.size) if node.is_file else ""
+            return "Read Only" if node.protected else "Writable"
+
+        if role == self.PATH_ROLE:
+            return node.path
+        if role == self.IS_FILE_ROLE:
+            return node.is_file
+        if role == self.STAT_ROLE:
+            return (node.mtime, node.size) if node.is_file else None
+
+        # Read-only visual indicators on the name column
+        if column == 0 and node.protected:
+            if role == Qt.ItemDataRole.FontRole:
+                return self.protected_font
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return self.protected_color
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                  role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder) -> None:
+        """Sort every loaded folder by column"""
+        self._sort_column = column
+        self._sort_order = order
+
+        folders = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                folders.append(node)
+                stack.extend(child for child in node.children if child.children)
+        self._sort_nodes(folders)
+
+    def _sort_nodes(self, folders: List[FileNode]) -> None:
+        """Re-order the children of the given folders, keeping persistent indexes valid"""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        targets = [(index.internalPointer(), index.column()) for index in old_indexes]
+
+        key = self._SORT_KEYS[self._sort_column]
+        reverse = self._sort_order == Qt.SortOrder.DescendingOrder
+        for folder in folders:
+            folder.children.sort(key=key, reverse=reverse)
+            for row, child in enumerate(folder.children):
+                child.row = row
+
+        new_indexes = [self.createIndex(node.row, column, node) for node, column in targets]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
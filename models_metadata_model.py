@@ -1,27 +1,56 @@
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 from typing import Dict, Optional, List
 from pathlib import Path
+from utils_metadata_storage import (store_path_for, read_store, read_excel, write_store, write_excel,
+                                    oldest_backup_slot, write_backup, MAX_BACKUPS,
+                                    basic_metadata_entry)
+
+logger = logging.getLogger('metadata')
+
+
+def _stat_files(file_paths: List[str]) -> Dict[str, os.stat_result]:
+    """
+    Stat many files, listing each folder once when several files share it
+    Directory listings carry the stats on Windows, saving a round trip per file on shares
+    """
+    by_folder: Dict[str, Dict[str, str]] = {}  # folder -> {name: path}
+    for file_path in file_paths:
+        by_folder.setdefault(os.path.dirname(file_path), {})[os.path.basename(file_path)] = file_path
+
+    file_stats = {}
+    for folder, names in by_folder.items():
+        if len(names) > 1:
+            with os.scandir(folder or '.') as entries:
+                for entry in entries:
+                    file_path = names.get(entry.name)
+                    if file_path is not None:
+                        file_stats[file_path] = entry.stat()
+        # Single files, and any the listing did not return, are stat'ed directly
+        for file_path in names.values():
+            if file_path not in file_stats:
+                file_stats[file_path] = os.stat(file_path)
+    return file_stats
+
 
 class MetadataModel:
     def __init__(self, safety_manager, excel_path: str = "metadata.xlsx"):
         self.safety = safety_manager
         self.excel_path = excel_path
+        # Parquet is the working store when pyarrow is available; Excel is export-only then
+        self.store_path = store_path_for(excel_path)
         self.metadata_df = None
         self.backup_dir = "metadata_backups"
         self.metadata_cache = {}
+        self._path_index: Dict[str, int] = {}  # file path -> row label in metadata_df
+        self.version = 0  # bumped whenever metadata_df changes, for caches built from it
+        self._backup_pool = ThreadPoolExecutor(max_workers=1)  # writes backups in order
+        self._backup_version = None  # version of the last snapshot backed up
+        self._backup_slot: Optional[int] = None  # ring slot the next backup overwrites
         self.setup_model()
-        self.setup_logging()
-
-    def setup_logging(self):
-        """Configure logging"""
-        logging.basicConfig(
-            filename='metadata_operations.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
 
     def setup_model(self):
         """Initialize metadata model"""
@@ -29,15 +58,38 @@ class MetadataModel:
             os.makedirs(os.path.dirname(self.excel_path), exist_ok=True)
             os.makedirs(self.backup_dir, exist_ok=True)
             
-            if os.path.exists(self.excel_path):
-                self.metadata_df = pd.read_excel(self.excel_path)
+            if self.store_path != self.excel_path and os.path.exists(self.store_path):
+                self.metadata_df = read_store(self.store_path)
+            elif os.path.exists(self.excel_path):
+                # An existing workbook moves to the working store on the next save
+                self.metadata_df = read_excel(self.excel_path)
             else:
                 self.create_new_database()
+            self._rebuild_path_index()
                 
         except Exception as e:
-            logging.error(f"Error initializing metadata model: {str(e)}")
+            logger.error(f"Error initializing metadata model: {str(e)}")
             self.create_new_database()
 
+    def _rebuild_path_index(self):
+        """Map every file path to its row; the first row wins for duplicates"""
+        self.version += 1
+        self._path_index = {}
+        if 'file_path' not in self.metadata_df.columns:
+            return
+        for file_path, label in zip(self.metadata_df['file_path'], self.metadata_df.index):
+            self._path_index.setdefault(file_path, label)
+
+    def _append_row(self, file_path: str, metadata: Dict):
+        """Add a row for a file not yet in metadata_df without rebuilding the frame"""
+        for column in metadata:
+            if column not in self.metadata_df.columns:
+                self.metadata_df[column] = None
+        label = self.metadata_df.index.max() + 1 if len(self.metadata_df) else 0
+        # Enlarging through .loc fills the new row; columns missing from metadata stay empty
+        self.metadata_df.loc[label] = pd.Series(metadata)
+        self._path_index[file_path] = label
+
     def create_new_database(self):
         """Create new metadata database with predefined columns"""
         self.metadata_df = pd.DataFrame(columns=[
@@ -78,6 +130,8 @@ class MetadataModel:
             'approved_by',
             'comments'
         ])
+        self._path_index = {}
+        self.version += 1
         self.save_database()
 
     def add_files_basic_metadata(self, file_paths: list) -> bool:
@@ -87,93 +141,75 @@ class MetadataModel:
             self.backup_current_metadata()
             
             # Create new entries for each file
+            rows = {}  # file path -> entry, last one wins
+            file_stats = _stat_files(file_paths)
+            # One timestamp for the whole batch
+            now = datetime.now()
             for file_path in file_paths:
-                metadata = {
-                    # Basic file information
-                    'file_path': file_path,
-                    'file_name': os.path.basename(file_path),
-                    'file_location': os.path.dirname(file_path),
-                    'file_extension': os.path.splitext(file_path)[1].lower(),
-                    'file_size': os.path.getsize(file_path),
-                    'date_added': datetime.now(),
-                    'last_modified': datetime.fromtimestamp(os.path.getmtime(file_path)),
-                    
-                    # Initialize other fields as empty
-                    'project_number': '',
-                    'department': '',
-                    'area': '',
-                    'type': '',
-                    'source': '',
-                    'revision': '',
-                    'issue_status': '',
-                    'work_status': '',
-                    'scale': '',
-                    'paper_size': '',
-                    'applicable_codes': '',
-                    'equipment_tags': '',
-                    'related_documents': '',
-                    'priority': '',
-                    'milestone': '',
-                    'contract_phase': '',
-                    'budget_code': '',
-                    'deliverable_id': '',
-                    'approved_by': '',
-                    'comments': ''
-                }
-                
-                # Remove existing entry if it exists
-                self.metadata_df = self.metadata_df[
-                    self.metadata_df['file_path'] != file_path
-                ]
-                
-                # Add new entry
-                self.metadata_df = pd.concat([
-                    self.metadata_df, 
-                    pd.DataFrame([metadata])
-                ], ignore_index=True)
+                stats = file_stats[file_path]
+                rows[file_path] = basic_metadata_entry(file_path, stats, now)
+
+            # Replace existing entries and append new ones in one pass
+            self.metadata_df = self.metadata_df[
+                ~self.metadata_df['file_path'].isin(list(rows))
+            ]
+            self.metadata_df = pd.concat([
+                self.metadata_df,
+                pd.DataFrame(list(rows.values()))
+            ], ignore_index=True)
+            self._rebuild_path_index()
+            for file_path in rows:
+                self.metadata_cache.pop(file_path, None)
             
             # Save to Excel file
             return self.save_database()
             
         except Exception as e:
-            logging.error(f"Error adding basic metadata: {str(e)}")
+            logger.error(f"Error adding basic metadata: {str(e)}")
             return False
 
     def save_database(self) -> bool:
-        """Save metadata to Excel file"""
+        """Save metadata to the working store"""
+        try:
+            write_store(self.metadata_df, self.store_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving metadata: {str(e)}")
+            return False
+
+    def export_excel(self, path: Optional[str] = None) -> bool:
+        """Export metadata to an Excel workbook, by default excel_path"""
         try:
-            self.metadata_df.to_excel(self.excel_path, index=False)
+            write_excel(self.metadata_df, path or self.excel_path)
             return True
         except Exception as e:
-            logging.error(f"Error saving metadata: {str(e)}")
+            logger.error(f"Error exporting metadata to Excel: {str(e)}")
             return False
 
     def backup_current_metadata(self):
         """Create backup of current metadata"""
         try:
-            if os.path.exists(self.excel_path):
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_path = os.path.join(
-                    self.backup_dir, 
-                    f"metadata_backup_{timestamp}.xlsx"
-                )
-                self.metadata_df.to_excel(backup_path, index=False)
-                self.cleanup_old_backups()
+            if os.path.exists(self.store_path) or os.path.exists(self.excel_path):
+                # Unchanged since the last backup, so the snapshot would be identical
+                if self.version == self._backup_version:
+                    return
+                self._backup_version = self.version
+                extension = os.path.splitext(self.store_path)[1]
+                if self._backup_slot is None:
+                    self._backup_slot = oldest_backup_slot(self.backup_dir, extension)
+                slot = self._backup_slot
+                self._backup_slot = (slot + 1) % MAX_BACKUPS
+                # Write a copy in the background; the caller goes on to modify metadata_df
+                self._backup_pool.submit(self._write_backup, self.metadata_df.copy(), slot, extension)
         except Exception as e:
-            logging.error(f"Error creating metadata backup: {str(e)}")
+            logger.error(f"Error creating metadata backup: {str(e)}")
 
-    def cleanup_old_backups(self, max_backups: int = 10):
-        """Remove old backup files"""
+    def _write_backup(self, df: pd.DataFrame, slot: int, extension: str):
+        """Write a backup snapshot over the oldest one (runs on the backup thread)"""
         try:
-            backups = sorted([
-                os.path.join(self.backup_dir, f) 
-                for f in os.listdir(self.backup_dir)
-            ])
-            
-            while len(backups) > max_backups:
-                os.remove(backups.pop(0))
+            write_backup(df, self.backup_dir, slot, extension)
         except Exception as e:
-            logging.error(f"Error cleaning up backups: {str(e)}")
+            logger.error(f"Error creating metadata backup: {str(e)}")
 
     def get_metadata(self, file_path: str) -> Optional[Dict]:
         """Retrieve metadata for specific file"""
@@ -182,44 +218,65 @@ class MetadataModel:
             if file_path in self.metadata_cache:
                 return self.metadata_cache[file_path].copy()
 
-            # Query dataframe
-            file_data = self.metadata_df[
-                self.metadata_df['file_path'] == file_path
-            ]
-
-            if file_data.empty:
+            label = self._path_index.get(file_path)
+            if label is None:
                 return None
 
-            metadata = file_data.iloc[0].to_dict()
+            metadata = self.metadata_df.loc[label].to_dict()
             self.metadata_cache[file_path] = metadata.copy()
             return metadata
 
         except Exception as e:
-            logging.error(f"Error retrieving metadata for {file_path}: {str(e)}")
+            logger.error(f"Error retrieving metadata for {file_path}: {str(e)}")
             return None
 
     def search_metadata(self, search_terms: Dict) -> pd.DataFrame:
         """Search metadata based on criteria"""
         try:
-            result = self.metadata_df.copy()
+            df = self.metadata_df
+            # Combine every criterion into one mask and index once
+            mask = pd.Series(True, index=df.index)
             
             for field, value in search_terms.items():
                 if value:
                     if isinstance(value, list):
-                        result = result[result[field].isin(value)]
+                        mask &= df[field].isin(value)
                     else:
-                        result = result[result[field].str.contains(
+                        mask &= df[field].astype('string').str.contains(
                             str(value), 
                             case=False, 
-                            na=False
-                        )]
+                            na=False,
+                            regex=False
+                        )
             
-            return result
+            return df.loc[mask]
             
         except Exception as e:
-            logging.error(f"Error searching metadata: {str(e)}")
+            logger.error(f"Error searching metadata: {str(e)}")
             return pd.DataFrame()
 
+    def get_statuses_batch(self, file_paths: List[str], default: str = "Unknown") -> List[str]:
+        """Work status for each path, or default where none is recorded"""
+        try:
+            statuses = [default] * len(file_paths)
+            if 'work_status' not in self.metadata_df.columns:
+                return statuses
+            positions = []
+            labels = []
+            for position, file_path in enumerate(file_paths):
+                label = self._path_index.get(file_path)
+                if label is not None:
+                    positions.append(position)
+                    labels.append(label)
+            # One indexed lookup for every known path
+            for position, value in zip(positions, self.metadata_df.loc[labels, 'work_status']):
+                if isinstance(value, str) and value:
+                    statuses[position] = value
+            return statuses
+        except Exception as e:
+            logger.error(f"Error getting file statuses: {str(e)}")
+            return [default] * len(file_paths)
+
     def get_unique_values(self, field: str) -> List:
         """Get unique values for a field"""
         try:
@@ -227,29 +284,35 @@ class MetadataModel:
                 return sorted(self.metadata_df[field].dropna().unique().tolist())
             return []
         except Exception as e:
-            logging.error(f"Error getting unique values: {str(e)}")
+            logger.error(f"Error getting unique values: {str(e)}")
             return []
 
     def update_metadata(self, file_path: str, metadata: Dict) -> bool:
         """Update metadata for specific file"""
         try:
             if self.safety.is_protected_path(file_path):
-                logging.warning(f"Attempted to update protected file metadata: {file_path}")
+                logger.warning(f"Attempted to update protected file metadata: {file_path}")
                 return False
 
             # Update timestamp
             metadata['last_modified'] = datetime.now()
 
-            # Remove existing entry
-            self.metadata_df = self.metadata_df[
-                self.metadata_df['file_path'] != file_path
-            ]
-            
-            # Add updated entry
-            self.metadata_df = pd.concat([
-                self.metadata_df, 
-                pd.DataFrame([metadata])
-            ], ignore_index=True)
+            label = self._path_index.get(file_path)
+            if label is not None:
+                # Update the existing row in place
+                for column in metadata:
+                    if column not in self.metadata_df.columns:
+                        self.metadata_df[column] = None
+                    elif self.metadata_df[column].dtype != object:
+                        # Edited fields hold text; avoid incompatible-dtype assignment
+                        self.metadata_df[column] = self.metadata_df[column].astype(object)
+                self.metadata_df.loc[label, list(metadata)] = list(metadata.values())
+                self.version += 1
+            else:
+                # Add new entry
+                metadata['file_path'] = file_path
+                self._append_row(file_path, metadata)
+                self.version += 1
 
             # Update cache
             self.metadata_cache[file_path] = metadata.copy()
@@ -259,7 +322,7 @@ class MetadataModel:
             return self.save_database()
 
         except Exception as e:
-            logging.error(f"Error updating metadata for {file_path}: {str(e)}")
+            logger.error(f"Error updating metadata for {file_path}: {str(e)}")
             return False
 
     def clear_cache(self):
@@ -281,5 +344,5 @@ class MetadataModel:
                 'oldest_file': self.metadata_df['date_added'].min()
             }
         except Exception as e:
-            logging.error(f"Error getting statistics: {str(e)}")
+            logger.error(f"Error getting statistics: {str(e)}")
             return {}
\ No newline at end of file
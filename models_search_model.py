@@ -2,6 +2,8 @@
 from typing import List, Dict, Optional
 import pandas as pd
 from datetime import datetime
+from collections import OrderedDict
+import json
 import logging
 from PyQt6.QtCore import QObject, pyqtSignal
 
@@ -15,13 +17,16 @@ class SearchModel(QObject):
         self.metadata_model = metadata_model
         self.search_history = []
         self.max_history = 50
+        self.max_cache_entries = 100
         self.setup_search()
 
     def setup_search(self):
         """Initialize search functionality"""
         try:
-            self.search_cache = {}
+            self.search_cache = OrderedDict()  # search key -> result row labels, least recent first
             self.last_search = None
+            self._lower_cache: Dict[str, pd.Series] = {}  # column -> lowercased text
+            self._cache_version = None  # metadata version the caches were built from
             logging.info("Search model initialized successfully")
         except Exception as e:
             logging.error(f"Error initializing search model: {str(e)}")
@@ -44,9 +49,12 @@ class SearchModel(QObject):
             self.searchStarted.emit()
             
             # Check cache first
-            cache_key = str(search_params)
+            self._sync_caches()
+            cache_key = self._cache_key(search_params)
             if cache_key in self.search_cache:
-                self.searchCompleted.emit(self.search_cache[cache_key])
+                self.search_cache.move_to_end(cache_key)
+                labels = self.search_cache[cache_key]
+                self.searchCompleted.emit(self.metadata_model.metadata_df.loc[labels])
                 return
 
             # Build search query
@@ -66,7 +74,7 @@ class SearchModel(QObject):
             self.cache_results(cache_key, sorted_results)
             
             # Update search history
-            self._update_search_history(search_params)
+            self._update_search_history(search_params, len(sorted_results))
             
             self.searchCompleted.emit(sorted_results)
 
@@ -86,10 +94,27 @@ class SearchModel(QObject):
         mask = pd.Series(False, index=self.metadata_model.metadata_df.index)
         
         for column in self.metadata_model.metadata_df.select_dtypes(include=['object']):
-            mask |= self.metadata_model.metadata_df[column].astype(str).str.lower().str.contains(text_search, na=False)
+            mask |= self._get_lower(column).str.contains(text_search, na=False, regex=False)
             
         return self.metadata_model.metadata_df[mask]
 
+    def _sync_caches(self):
+        """Drop cached results and lowercased columns once the metadata has changed"""
+        version = getattr(self.metadata_model, 'version', None)
+        if version is None or version != self._cache_version:
+            self.search_cache.clear()
+            self._lower_cache.clear()
+            self._cache_version = version
+
+    def _get_lower(self, column: str) -> pd.Series:
+        """Lowercased text of a column, reused until the metadata changes"""
+        self._sync_caches()
+        lower = self._lower_cache.get(column)
+        if lower is None:
+            lower = self.metadata_model.metadata_df[column].astype(str).str.lower()
+            self._lower_cache[column] = lower
+        return lower
+
     def _apply_filters(self, df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
         """Apply metadata filters to results"""
         if not filters:
@@ -114,23 +139,27 @@ class SearchModel(QObject):
             return df.sort_values(by=sort_by, ascending=ascending)
         return df
 
+    @staticmethod
+    def _cache_key(search_params: Dict) -> str:
+        """Cache key that is the same for equal parameters in any key order"""
+        return json.dumps(search_params, sort_keys=True, default=str)
+
     def cache_results(self, cache_key: str, results: pd.DataFrame) -> None:
         """Cache search results"""
-        self.search_cache[cache_key] = results
+        # Row labels are enough to rebuild the results from the unchanged metadata
+        self.search_cache[cache_key] = results.index.to_numpy()
+        self.search_cache.move_to_end(cache_key)
         
-        # Limit cache size
-        if len(self.search_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = list(self.search_cache.keys())[:-50]
-            for key in oldest_keys:
-                del self.search_cache[key]
-
-    def _update_search_history(self, search_params: Dict) -> None:
+        # Limit cache size by evicting the least recently used entries
+        while len(self.search_cache) > self.max_cache_entries:
+            self.search_cache.popitem(last=False)
+
+    def _update_search_history(self, search_params: Dict, results_count: int) -> None:
         """Update search history"""
         self.search_history.insert(0, {
             'params': search_params,
             'timestamp': datetime.now(),
-            'results_count': len(self.search_cache[str(search_params)])
+            'results_count': results_count
         })
         
         # Limit history size
@@ -152,7 +181,7 @@ class SearchModel(QObject):
         for column in self.metadata_model.metadata_df.select_dtypes(include=['object']):
             column_values = self.metadata_model.metadata_df[column].astype(str)
             matches = column_values[
-                column_values.str.lower().str.contains(partial_text.lower(), na=False)
+                self._get_lower(column).str.contains(partial_text.lower(), na=False, regex=False)
             ].unique()
             suggestions.extend(matches)
 
@@ -1,31 +1,45 @@
 
 from typing import List, Set
+from bisect import bisect_right
 import os
 import logging
 from pathlib import Path
 
+logger = logging.getLogger('access_safety')
+
 class AccessSafety:
     def __init__(self):
         self.read_only_paths: Set[str] = set()
-        self.setup_logging()
-        
-    def setup_logging(self):
-        """Configure safety logging"""
-        logging.basicConfig(
-            filename='access_safety.log',
-            level=logging.WARNING,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-    
+        self._sorted_prefixes: List[str] = []
+        self.version = 0  # bumped whenever the protected paths change, for cached results
+
     def set_protected_paths(self, paths: List[str]):
         """Set paths that should be read-only"""
         self.read_only_paths = {os.path.normpath(p) for p in paths}
+        self._build_prefix_index()
+        self.version += 1
+
+    @staticmethod
+    def _as_prefix(path: str) -> str:
+        """Normalized path ending in a separator, so matches stop at component boundaries"""
+        normalized = os.path.normpath(path)
+        return normalized if normalized.endswith(os.sep) else normalized + os.sep
+
+    def _build_prefix_index(self):
+        """Sort protected prefixes, dropping any already covered by a shorter one"""
+        self._sorted_prefixes = []
+        for prefix in sorted(self._as_prefix(p) for p in self.read_only_paths):
+            if self._sorted_prefixes and prefix.startswith(self._sorted_prefixes[-1]):
+                continue
+            self._sorted_prefixes.append(prefix)
     
     def is_protected_path(self, path: str) -> bool:
         """Check if path is in protected area"""
-        normalized_path = os.path.normpath(path)
-        return any(normalized_path.startswith(protected) 
-                  for protected in self.read_only_paths)
+        normalized_path = self._as_prefix(path)
+        # With no prefix nested in another, the only candidate match is the
+        # greatest prefix sorting at or before the path
+        index = bisect_right(self._sorted_prefixes, normalized_path) - 1
+        return index >= 0 and normalized_path.startswith(self._sorted_prefixes[index])
     
     def validate_operation(self, path: str, operation_type: str) -> bool:
         """
@@ -33,7 +47,7 @@ class AccessSafety:
         operation_type: 'read' or 'write'
         """
         if operation_type.lower() == 'write' and self.is_protected_path(path):
-            logging.warning(f"Blocked write attempt to protected path: {path}")
+            logger.warning(f"Blocked write attempt to protected path: {path}")
             return False
         return True
     
@@ -42,7 +56,7 @@ class AccessSafety:
         try:
             return os.access(path, os.R_OK)
         except Exception as e:
-            logging.error(f"Read validation error: {str(e)}")
+            logger.error(f"Read validation error: {str(e)}")
             return False
     
     @staticmethod
@@ -0,0 +1,17 @@
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+def file_extension(name: str) -> str:
+    """Extension of a file name with its dot, as os.path.splitext gives it"""
+    stem, dot, ext = name.rpartition('.')
+    # Like splitext, leading dots (".gitignore") are not an extension
+    return dot + ext if stem.strip('.') else ''
+
+
+def format_size(size) -> str:
+    """Format file size for display"""
+    if size <= 0:
+        return f"{size:.1f} B"
+    # Each unit step is 10 bits, capped at the largest unit; fractions of a byte stay in B
+    index = min(max(int(size).bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
@@ -1,23 +1,40 @@
 import os
+import codecs
 import subprocess
 import logging
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 from PyQt6.QtCore import QMimeDatabase
+from utils_file_info import format_size
+
+logger = logging.getLogger('file_operations')
+
+# Descriptions for the project's common file types, resolved without touching the file
+_FILE_TYPES = {
+    '.dwg': 'AutoCAD Drawing',
+    '.pdf': 'PDF Document',
+    '.doc': 'Word Document',
+    '.docx': 'Word Document',
+    '.xls': 'Excel Spreadsheet',
+    '.xlsx': 'Excel Spreadsheet',
+    '.rvt': 'Revit File',
+    '.txt': 'Text File',
+    '.csv': 'CSV File',
+    '.zip': 'Compressed Archive'
+}
+_TYPE_CACHE_SIZE = 1024
+# Previewed without sniffing; other files must look like UTF-8 text
+_TEXT_EXTENSIONS = frozenset({'.txt', '.log', '.csv', '.md', '.py', '.json', '.xml', '.yaml', '.yml'})
+_SNIFF_SIZE = 512
 
 class FileOperations:
-    def __init__(self, safety_manager):
+    def __init__(self, safety_manager, stat_threads: int = 16):
         self.mime_db = QMimeDatabase()
         self.safety = safety_manager
-        self.setup_logging()
-
-    def setup_logging(self):
-        """Configure logging for file operations"""
-        logging.basicConfig(
-            filename='file_operations.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        self._ext_type_cache = {}  # extension -> file type description
+        # Folder scans run concurrently so stat round-trips on network drives overlap
+        self._pool = ThreadPoolExecutor(max_workers=stat_threads)
 
     def open_file(self, file_path: str, read_only: bool = True) -> bool:
         """
@@ -26,7 +43,7 @@ class FileOperations:
         """
         try:
             if not self.safety.safe_read_operation(file_path):
-                logging.warning(f"Access denied to file: {file_path}")
+                logger.warning(f"Access denied to file: {file_path}")
                 return False
 
             if os.name == 'nt':  # Windows
@@ -41,11 +58,11 @@ class FileOperations:
             else:  # Linux/Mac
                 subprocess.call(('xdg-open', file_path))
             
-            logging.info(f"Successfully opened file: {file_path}")
+            logger.info(f"Successfully opened file: {file_path}")
             return True
 
         except Exception as e:
-            logging.error(f"Error opening file {file_path}: {str(e)}")
+            logger.error(f"Error opening file {file_path}: {str(e)}")
             return False
 
     def get_file_info(self, file_path: str) -> Optional[dict]:
@@ -72,35 +89,40 @@ class FileOperations:
             }
 
         except Exception as e:
-            logging.error(f"Error getting file info for {file_path}: {str(e)}")
+            logger.error(f"Error getting file info for {file_path}: {str(e)}")
             return None
 
     def get_file_type(self, file_path: str) -> str:
         """
-        Determine file type using mime database (read-only operation)
+        Determine file type from its extension (read-only operation)
         Returns: File type description
         """
-        try:
-            if not self.safety.safe_read_operation(file_path):
-                return "Unknown"
+        ext = os.path.splitext(file_path)[1].lower()
+        file_type = _FILE_TYPES.get(ext)
+        if file_type is not None:
+            return file_type
+        if not ext:
+            # Extensionless names can still match whole-name patterns
+            return self._lookup_file_type(file_path, ext)
+        # Name-based matching depends only on the extension, so look each one up once
+        file_type = self._ext_type_cache.get(ext)
+        if file_type is None:
+            file_type = self._lookup_file_type("x" + ext, ext)
+            if len(self._ext_type_cache) >= _TYPE_CACHE_SIZE:
+                self._ext_type_cache.clear()
+            self._ext_type_cache[ext] = file_type
+        return file_type
 
-            mime_type = self.mime_db.mimeTypeForFile(file_path)
-            return mime_type.comment()
-        except:
-            ext = os.path.splitext(file_path)[1].lower()
-            types = {
-                '.dwg': 'AutoCAD Drawing',
-                '.pdf': 'PDF Document',
-                '.doc': 'Word Document',
-                '.docx': 'Word Document',
-                '.xls': 'Excel Spreadsheet',
-                '.xlsx': 'Excel Spreadsheet',
-                '.rvt': 'Revit File',
-                '.txt': 'Text File',
-                '.csv': 'CSV File',
-                '.zip': 'Compressed Archive'
-            }
-            return types.get(ext, f"{ext[1:].upper()} File" if ext else "Unknown")
+    def _lookup_file_type(self, name: str, ext: str) -> str:
+        """Describe a file type from the MIME database, by name only"""
+        try:
+            # Match on the name only; content sniffing would open the file
+            mime_type = self.mime_db.mimeTypeForFile(name, QMimeDatabase.MatchMode.MatchExtension)
+            if not mime_type.isDefault():
+                return mime_type.comment()
+        except Exception as e:
+            logger.error(f"Error looking up type for {name}: {str(e)}")
+        return f"{ext[1:].upper()} File" if ext else "Unknown"
 
     def get_directory_size(self, directory: str) -> Tuple[int, int]:
         """
@@ -114,23 +136,14 @@ class FileOperations:
         file_count = 0
         
         try:
-            for root, _, files in os.walk(directory):
-                if not self.safety.safe_read_operation(root):
-                    continue
-                    
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self.safety.safe_read_operation(file_path):
-                        try:
-                            total_size += os.path.getsize(file_path)
-                            file_count += 1
-                        except:
-                            continue
+            for _, stats in self._walk_files(directory):
+                total_size += stats.st_size
+                file_count += 1
             
             return total_size, file_count
 
         except Exception as e:
-            logging.error(f"Error calculating directory size for {directory}: {str(e)}")
+            logger.error(f"Error calculating directory size for {directory}: {str(e)}")
             return 0, 0
 
     def get_recent_files(self, directory: str, days: int = 7) -> List[str]:
@@ -145,33 +158,54 @@ class FileOperations:
         cutoff_time = datetime.now().timestamp() - (days * 86400)
 
         try:
-            for root, _, files in os.walk(directory):
-                if not self.safety.safe_read_operation(root):
-                    continue
-                    
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self.safety.safe_read_operation(file_path):
-                        try:
-                            mod_time = os.path.getmtime(file_path)
-                            if mod_time > cutoff_time:
-                                recent_files.append(file_path)
-                        except:
-                            continue
-
-            return sorted(recent_files, key=lambda x: os.path.getmtime(x), reverse=True)
+            for file_path, stats in self._walk_files(directory):
+                if stats.st_mtime > cutoff_time:
+                    recent_files.append((stats.st_mtime, file_path))
+
+            recent_files.sort(reverse=True)
+            return [file_path for _, file_path in recent_files]
 
         except Exception as e:
-            logging.error(f"Error getting recent files for {directory}: {str(e)}")
+            logger.error(f"Error getting recent files for {directory}: {str(e)}")
             return []
 
+    def _walk_files(self, directory: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (path, stats) for files in readable folders under directory, scanning in parallel"""
+        pending = {self._pool.submit(self._scan_folder_files, directory)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                pending.update(self._pool.submit(self._scan_folder_files, path) for path in subdirs)
+                yield from files
+
+    def _scan_folder_files(self, folder: str) -> Tuple[List[Tuple[str, os.stat_result]], List[str]]:
+        """Files in one readable folder with their stats, plus the subfolders to scan"""
+        files = []
+        subdirs = []
+        if not self.safety.safe_read_operation(folder):
+            return files, subdirs
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            # Like os.walk, linked folders are not descended into
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            # Files inherit the folder's clearance; stats need no read access
+                            files.append((entry.path, entry.stat()))
+                    except OSError:
+                        continue
+        except OSError:
+            # Unlistable folders are skipped, as os.walk does
+            pass
+        return files, subdirs
+
     def format_file_size(self, size_in_bytes: int) -> str:
         """Format file size for display"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_in_bytes < 1024:
-                return f"{size_in_bytes:.1f} {unit}"
-            size_in_bytes /= 1024
-        return f"{size_in_bytes:.1f} PB"
+        return format_size(size_in_bytes)
 
     def check_file_access(self, file_path: str) -> dict:
         """
@@ -196,7 +230,7 @@ class FileOperations:
 
         except Exception as e:
             result['error'] = str(e)
-            logging.error(f"Error checking file access for {file_path}: {str(e)}")
+            logger.error(f"Error checking file access for {file_path}: {str(e)}")
 
         return result
 
@@ -209,21 +243,23 @@ class FileOperations:
             return None
 
         try:
-            if not os.path.exists(file_path) or not os.path.isfile(file_path):
+            if not os.path.isfile(file_path):
                 return None
 
-            # Check if file is text-based
-            mime_type = self.mime_db.mimeTypeForFile(file_path)
-            if not mime_type.inherits('text/plain'):
+            # Read once; the head doubles as the text check for unknown extensions
+            with open(file_path, 'rb') as f:
+                data = f.read(max_size * 4)  # enough bytes for max_size UTF-8 characters
+            ext = os.path.splitext(file_path)[1].lower()
+            if ext not in _TEXT_EXTENSIONS and b'\0' in data[:_SNIFF_SIZE]:
                 return None
 
-            # Read preview
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read(max_size)
-                if len(content) == max_size:
-                    content += "..."
-                return content
+            # Not decoding the final chunk tolerates a character cut off at the end
+            content = codecs.getincrementaldecoder('utf-8')().decode(data)
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            if len(content) >= max_size:
+                content = content[:max_size] + "..."
+            return content
 
         except Exception as e:
-            logging.error(f"Error creating preview for {file_path}: {str(e)}")
-            return None
\ No newline at end of file
+            logger.error(f"Error creating preview for {file_path}: {str(e)}")
+            return None
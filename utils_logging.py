@@ -0,0 +1,22 @@
+import os
+import logging
+from logging.handlers import MemoryHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Records are held and written in chunks; errors are written straight away
+_BUFFER_CAPACITY = 1024
+
+
+def add_file_log(logger_name: str, filename: str, level: int = logging.INFO):
+    """Send a named logger's records to its own file, buffered in memory"""
+    logger = logging.getLogger(logger_name)
+    path = os.path.abspath(filename)
+    for handler in logger.handlers:
+        if getattr(getattr(handler, 'target', None), 'baseFilename', None) == path:
+            return  # already logging to this file
+    file_handler = logging.FileHandler(path)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    # logging.shutdown at exit flushes whatever is still buffered
+    buffered = MemoryHandler(_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler)
+    buffered.setLevel(level)
+    logger.addHandler(buffered)
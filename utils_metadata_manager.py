@@ -1,78 +1,110 @@
 import pandas as pd
 import os
 import json
+import threading
+from functools import wraps
 from datetime import datetime
 import logging
 from typing import Dict, Optional, List
 from pathlib import Path
+from collections import OrderedDict
+from PyQt6.QtCore import QTimer
+from utils_metadata_storage import (store_path_for, read_store, read_excel, write_store, write_excel,
+                                    oldest_backup_slot, write_backup, MAX_BACKUPS,
+                                    remove_legacy_backups, basic_metadata_entry)
+from utils_logging import add_file_log
+
+FLUSH_DELAY_MS = 500
+
+logger = logging.getLogger('metadata_manager')
+
+
+def _locked(method):
+    """Run a MetadataManager method while holding the manager's lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class MetadataManager:
+    MAX_CACHE_ENTRIES = 4096
+
     def add_files_basic_metadata(self, file_paths: list) -> bool:
         """Add basic metadata for files to database"""
         try:
-            # Create backup before modifying
-            self.backup_current_metadata()
-            
-            # Create new entries for each file
+            # Create new entries for each file; stat'ing needs no lock
+            rows = {}  # file path -> entry, last one wins
+            # One timestamp for the whole batch
+            now = datetime.now()
             for file_path in file_paths:
-                metadata = {
-                    # Basic file information
-                    'file_path': file_path,
-                    'file_name': os.path.basename(file_path),
-                    'file_location': os.path.dirname(file_path),
-                    'file_extension': os.path.splitext(file_path)[1].lower(),
-                    'file_size': os.path.getsize(file_path),
-                    'date_added': datetime.now(),
-                    'last_modified': datetime.fromtimestamp(os.path.getmtime(file_path)),
-                    
-                    # Initialize other fields as empty
-                    'project_number': '',
-                    'department': '',
-                    'area': '',
-                    'type': '',
-                    'source': '',
-                    'revision': '',
-                    'issue_status': '',
-                    'work_status': '',
-                    'scale': '',
-                    'paper_size': '',
-                    'applicable_codes': '',
-                    'equipment_tags': '',
-                    'related_documents': '',
-                    'priority': '',
-                    'milestone': '',
-                    'contract_phase': '',
-                    'budget_code': '',
-                    'deliverable_id': '',
-                    'approved_by': '',
-                    'comments': ''
-                }
-                
-                # Remove existing entry if it exists
-                self.metadata_df = self.metadata_df[
-                    self.metadata_df['file_path'] != file_path
-                ]
-                
-                # Add new entry
+                stats = os.stat(file_path)
+                rows[file_path] = basic_metadata_entry(file_path, stats, now)
+
+            # Runs on the metadata worker thread while the GUI thread reads and edits.
+            # Only the swap happens under the lock; the writes work on snapshots
+            with self._lock:
+                # The replaced frame is not edited again, so it serves as the backup
+                previous = self.metadata_df
+
+                # Replace existing entries and append new ones in one pass
                 self.metadata_df = pd.concat([
-                    self.metadata_df, 
-                    pd.DataFrame([metadata])
+                    previous[~previous['file_path'].isin(list(rows))],
+                    pd.DataFrame(list(rows.values()))
                 ], ignore_index=True)
-            
-            # Save to Excel file
-            return self.save_database()
+                self._rebuild_path_index()
+                for file_path in rows:
+                    self.metadata_cache.pop(file_path, None)
+                self._stats_cache = None
+
+                # Edits made in place from here on are left for the next flush
+                snapshot = self.metadata_df.copy()
+                self._dirty = False
+                self._snapshot_seq += 1
+                seq = self._snapshot_seq
+
+            saved = True
+            with self._write_lock:
+                self._write_backup(previous)
+                # A save of a later state may have got the write lock first
+                if seq > self._written_seq:
+                    try:
+                        write_store(snapshot, self.metadata_file)
+                        self._written_seq = seq
+                    except Exception as e:
+                        logger.error(f"Error saving metadata database: {str(e)}")
+                        saved = False
+            if not saved:
+                with self._lock:
+                    self._dirty = True  # retried by the next flush
+            return saved
             
         except Exception as e:
-            logging.error(f"Error adding basic metadata: {str(e)}")
+            logger.error(f"Error adding basic metadata: {str(e)}")
             return False
         
 
     def __init__(self, safety_manager, local_storage_path: str = "local_metadata"):
+        # Guards the table, index and caches; files are added from a worker thread
+        self._lock = threading.RLock()
+        # Serializes writes to the store and backups, which may run outside _lock
+        self._write_lock = threading.Lock()
+        self._snapshot_seq = 0  # numbers each state handed to a write, under _lock
+        self._written_seq = 0  # newest state written to the store, under _write_lock
         self.safety = safety_manager
         self.local_storage_path = local_storage_path
-        self.metadata_file = os.path.join(local_storage_path, "metadata.xlsx")
+        self.excel_path = os.path.join(local_storage_path, "metadata.xlsx")
+        # Parquet is the working store when pyarrow is available; Excel is export-only then
+        self.metadata_file = store_path_for(self.excel_path)
         self.backup_dir = os.path.join(local_storage_path, "backups")
-        self.metadata_cache = {}
+        self._backup_slot: Optional[int] = None  # ring slot the next backup overwrites
+        self.metadata_cache = OrderedDict()  # file path -> (mtime_ns, metadata), least recent first
+        self._stats_cache: Optional[Dict] = None
+        self._dirty = False  # edits applied in memory but not yet written
+        self._flush_timer: Optional[QTimer] = None
+        self._path_index: Dict[str, int] = {}  # file path -> row label in metadata_df
+        self._metadata_df: Optional[pd.DataFrame] = None  # read from storage on first use
         self.setup_storage()
         self.setup_logging()
 
@@ -83,23 +115,72 @@ class MetadataManager:
             os.makedirs(self.local_storage_path, exist_ok=True)
             os.makedirs(self.backup_dir, exist_ok=True)
             
-            if not os.path.exists(self.metadata_file):
+            if not os.path.exists(self.metadata_file) and not os.path.exists(self.excel_path):
                 self.create_new_metadata_file()
             
-            self.metadata_df = pd.read_excel(self.metadata_file)
-            
         except Exception as e:
-            logging.error(f"Error setting up metadata storage: {str(e)}")
-            self.metadata_df = pd.DataFrame()
+            logger.error(f"Error setting up metadata storage: {str(e)}")
+
+    @property
+    @_locked
+    def metadata_df(self) -> pd.DataFrame:
+        """Metadata table, read from storage the first time it is needed"""
+        if self._metadata_df is None:
+            self._load_metadata()
+        return self._metadata_df
+
+    @metadata_df.setter
+    def metadata_df(self, df: pd.DataFrame):
+        self._metadata_df = df
+
+    def is_loaded(self) -> bool:
+        """Whether the metadata table has been read from storage yet"""
+        return self._metadata_df is not None
+
+    @_locked
+    def _load_metadata(self):
+        """Read the metadata table and index it by file path"""
+        if self._metadata_df is not None:
+            return  # loaded by another thread while this one waited
+        try:
+            if os.path.exists(self.metadata_file):
+                self._metadata_df = read_store(self.metadata_file)
+            else:
+                # An existing workbook moves to the working store on the next save
+                self._metadata_df = read_excel(self.excel_path)
+        except Exception as e:
+            logger.error(f"Error loading metadata: {str(e)}")
+            self._metadata_df = pd.DataFrame()
+        self._rebuild_path_index()
 
+    @_locked
+    def _row_label(self, file_path: str) -> Optional[int]:
+        """Row label of a file's metadata, or None if it has none"""
+        if self._metadata_df is None:
+            self._load_metadata()
+        return self._path_index.get(file_path)
+
+    def _rebuild_path_index(self):
+        """Map every file path to its row; the first row wins for duplicates"""
+        self._path_index = {}
+        if 'file_path' not in self.metadata_df.columns:
+            return
+        for file_path, label in zip(self.metadata_df['file_path'], self.metadata_df.index):
+            self._path_index.setdefault(file_path, label)
+
+    def _append_row(self, file_path: str, metadata: Dict):
+        """Add a row for a file not yet in metadata_df without rebuilding the frame"""
+        for column in metadata:
+            if column not in self.metadata_df.columns:
+                self.metadata_df[column] = None
+        label = self.metadata_df.index.max() + 1 if len(self.metadata_df) else 0
+        # Enlarging through .loc fills the new row; columns missing from metadata stay empty
+        self.metadata_df.loc[label] = pd.Series(metadata)
+        self._path_index[file_path] = label
 
     def setup_logging(self):
         """Configure logging"""
-        logging.basicConfig(
-            filename=os.path.join(self.local_storage_path, 'metadata_operations.log'),
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        add_file_log('metadata_manager', os.path.join(self.local_storage_path, 'metadata_operations.log'))
 
 
     def create_new_metadata_file(self):
@@ -120,33 +201,52 @@ class MetadataManager:
             'last_indexed'
         ]
         df = pd.DataFrame(columns=columns)
-        df.to_excel(self.metadata_file, index=False)
+        write_store(df, self.metadata_file)
 
 
+    @_locked
     def read_metadata(self, file_path: str) -> Optional[Dict]:
         """Read metadata for specific file (read-only operation)"""
         try:
             if not self.safety.safe_read_operation(file_path):
                 return None
 
-            # Check cache first
-            if file_path in self.metadata_cache:
-                return self.metadata_cache[file_path].copy()
+            # Check cache first; an entry is stale once the file is modified
+            mtime = self._get_mtime_ns(file_path)
+            cached = self.metadata_cache.get(file_path)
+            if cached is not None and cached[0] == mtime:
+                self.metadata_cache.move_to_end(file_path)
+                return cached[1].copy()
 
-            # Query dataframe
-            file_data = self.metadata_df[
-                self.metadata_df['file_path'] == file_path
-            ]
-
-            if file_data.empty:
+            label = self._row_label(file_path)
+            if label is None:
                 return self.create_default_metadata(file_path)
 
-            metadata = file_data.iloc[0].to_dict()
-            self.metadata_cache[file_path] = metadata.copy()
+            metadata = self.metadata_df.loc[label].to_dict()
+            self._cache_metadata(file_path, mtime, metadata)
             return metadata
 
         except Exception as e:
-            logging.error(f"Error reading metadata for {file_path}: {str(e)}")
+            logger.error(f"Error reading metadata for {file_path}: {str(e)}")
+            return None
+
+    def get_metadata(self, file_path: str) -> Optional[Dict]:
+        """Get metadata for a file, served from cache when unchanged"""
+        return self.read_metadata(file_path)
+
+    def _cache_metadata(self, file_path: str, mtime: Optional[int], metadata: Dict):
+        """Store a copy of metadata, evicting the least recently used entry"""
+        self.metadata_cache[file_path] = (mtime, metadata.copy())
+        self.metadata_cache.move_to_end(file_path)
+        if len(self.metadata_cache) > self.MAX_CACHE_ENTRIES:
+            self.metadata_cache.popitem(last=False)
+
+    @staticmethod
+    def _get_mtime_ns(file_path: str) -> Optional[int]:
+        """Modification time used to validate cache entries, None if unavailable"""
+        try:
+            return os.stat(file_path).st_mtime_ns
+        except OSError:
             return None
 
     def create_default_metadata(self, file_path: str) -> Dict:
@@ -160,87 +260,195 @@ class MetadataManager:
             'file_size': os.path.getsize(file_path) if os.path.exists(file_path) else 0
         }
 
+    @_locked
     def update_metadata(self, file_path: str, metadata: Dict) -> bool:
         """Update metadata in local storage"""
         try:
             if self.safety.is_protected_path(file_path):
-                logging.warning(f"Attempted to update metadata for protected path: {file_path}")
+                logger.warning(f"Attempted to update metadata for protected path: {file_path}")
                 return False
 
             metadata['modified_date'] = datetime.now()
             metadata['file_path'] = file_path
+            self._begin_edit()
 
             # Update DataFrame
-            self.metadata_df = self.metadata_df[
-                self.metadata_df['file_path'] != file_path
-            ]
-            
-            self.metadata_df = pd.concat([
-                self.metadata_df, 
-                pd.DataFrame([metadata])
-            ], ignore_index=True)
+            self._merge_row(file_path, metadata)
 
             # Update cache
-            self.metadata_cache[file_path] = metadata.copy()
+            self._cache_metadata(file_path, self._get_mtime_ns(file_path), metadata)
+            self._stats_cache = None
 
-            # Save to local storage
-            self.backup_current_metadata()
-            self.metadata_df.to_excel(self.metadata_file, index=False)
+            # Written to local storage by the next flush
+            self.schedule_flush()
             
             return True
 
         except Exception as e:
-            logging.error(f"Error updating metadata for {file_path}: {str(e)}")
+            logger.error(f"Error updating metadata for {file_path}: {str(e)}")
             return False
 
+    @_locked
+    def update_metadata_many(self, metadata_by_path: Dict[str, Dict]) -> bool:
+        """Update metadata for several files with one backup and one write"""
+        try:
+            rows = {}
+            for file_path, metadata in metadata_by_path.items():
+                if self.safety.is_protected_path(file_path):
+                    logger.warning(f"Attempted to update metadata for protected path: {file_path}")
+                    continue
+                metadata['modified_date'] = datetime.now()
+                metadata['file_path'] = file_path
+                rows[file_path] = metadata
+            if not rows:
+                return len(metadata_by_path) == 0
+            self._begin_edit()
+
+            # Merge into the existing rows, keeping fields not being edited
+            for file_path, metadata in rows.items():
+                self._merge_row(file_path, metadata)
+
+            for file_path, metadata in rows.items():
+                self._cache_metadata(file_path, self._get_mtime_ns(file_path), metadata)
+            self._stats_cache = None
+
+            self.schedule_flush()
+            # Protected files were skipped, so the batch only partly succeeded
+            return len(rows) == len(metadata_by_path)
+
+        except Exception as e:
+            logger.error(f"Error updating metadata for {len(metadata_by_path)} files: {str(e)}")
+            return False
+
+    def _merge_row(self, file_path: str, metadata: Dict):
+        """Write metadata into the file's row in place, or append a new row"""
+        label = self._row_label(file_path)
+        if label is None:
+            self._append_row(file_path, metadata)
+            return
+        for column in metadata:
+            if column not in self.metadata_df.columns:
+                self.metadata_df[column] = None
+            elif self.metadata_df[column].dtype != object:
+                # Edited fields hold text; avoid incompatible-dtype assignment
+                self.metadata_df[column] = self.metadata_df[column].astype(object)
+        self.metadata_df.loc[label, list(metadata)] = list(metadata.values())
+
+    def _begin_edit(self):
+        """Back up the saved state once before the first unsaved edit"""
+        if not self._dirty:
+            self.backup_current_metadata()
+            self._dirty = True
+
+    def schedule_flush(self):
+        """Write shortly, folding a burst of edits into one write"""
+        if self._flush_timer is None:
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.setInterval(FLUSH_DELAY_MS)
+            self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    def cancel_scheduled_flush(self):
+        """Stop a pending flush, for callers about to save the database themselves"""
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+
+    @_locked
+    def flush(self) -> bool:
+        """Write pending edits, if any, to local storage"""
+        if not self._dirty:
+            return True
+        return self.save_database()
+
+    def has_pending_changes(self) -> bool:
+        """Whether edits are waiting to be written"""
+        return self._dirty
+
+    @_locked
+    def save_database(self) -> bool:
+        """Write the metadata database to local storage"""
+        if self._metadata_df is None:
+            return True  # never loaded, so nothing has changed
+        try:
+            self._snapshot_seq += 1
+            with self._write_lock:
+                write_store(self.metadata_df, self.metadata_file)
+                self._written_seq = self._snapshot_seq
+            # The write covers any edits still waiting on the flush timer
+            self._dirty = False
+            return True
+        except Exception as e:
+            logger.error(f"Error saving metadata database: {str(e)}")
+            return False
+
+    @_locked
+    def export_to_excel(self) -> bool:
+        """Write the metadata workbook at excel_path for viewing in Excel"""
+        if self.metadata_file == self.excel_path:
+            # The workbook is the working store; just bring it up to date
+            return self.flush()
+        try:
+            write_excel(self.metadata_df, self.excel_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting metadata to Excel: {str(e)}")
+            return False
+
+    @_locked
     def backup_current_metadata(self):
         """Create backup of current metadata"""
+        with self._write_lock:
+            self._write_backup(self.metadata_df)
+
+    def _write_backup(self, df: pd.DataFrame):
+        """Write df to the next backup slot; the caller holds _write_lock"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = os.path.join(
-                self.backup_dir, 
-                f"metadata_backup_{timestamp}.xlsx"
-            )
-            self.metadata_df.to_excel(backup_path, index=False)
-            self.cleanup_old_backups()
+            extension = os.path.splitext(self.metadata_file)[1]
+            if self._backup_slot is None:
+                self._remove_legacy_backups()
+                self._backup_slot = oldest_backup_slot(self.backup_dir, extension)
+            write_backup(df, self.backup_dir, self._backup_slot, extension)
+            self._backup_slot = (self._backup_slot + 1) % MAX_BACKUPS
         except Exception as e:
-            logging.error(f"Error creating metadata backup: {str(e)}")
+            logger.error(f"Error creating metadata backup: {str(e)}")
 
-    def cleanup_old_backups(self, max_backups: int = 10):
-        """Remove old backup files"""
+    def _remove_legacy_backups(self):
+        """Delete the timestamped backups the ring replaced, once per session"""
         try:
-            backups = sorted([
-                os.path.join(self.backup_dir, f) 
-                for f in os.listdir(self.backup_dir)
-            ])
-            
-            while len(backups) > max_backups:
-                os.remove(backups.pop(0))
+            removed = remove_legacy_backups(self.backup_dir)
+            if removed:
+                logger.info(f"Removed {removed} legacy timestamped backups")
         except Exception as e:
-            logging.error(f"Error cleaning up backups: {str(e)}")
+            logger.error(f"Error removing legacy backups: {str(e)}")
 
+    @_locked
     def search_metadata(self, criteria: Dict) -> pd.DataFrame:
         """Search metadata based on criteria (read-only operation)"""
         try:
-            result = self.metadata_df.copy()
+            df = self.metadata_df
+            # Combine every criterion into one mask and index once
+            mask = pd.Series(True, index=df.index)
             
             for field, value in criteria.items():
                 if value:
                     if isinstance(value, list):
-                        result = result[result[field].isin(value)]
+                        mask &= df[field].isin(value)
                     else:
-                        result = result[result[field].str.contains(
+                        mask &= df[field].astype('string').str.contains(
                             str(value), 
                             case=False, 
-                            na=False
-                        )]
+                            na=False,
+                            regex=False
+                        )
             
-            return result
+            return df.loc[mask]
             
         except Exception as e:
-            logging.error(f"Error searching metadata: {str(e)}")
+            logger.error(f"Error searching metadata: {str(e)}")
             return pd.DataFrame()
 
+    @_locked
     def get_unique_values(self, field: str) -> List:
         """Get unique values for a field (read-only operation)"""
         try:
@@ -248,9 +456,40 @@ class MetadataManager:
                 return sorted(self.metadata_df[field].unique().tolist())
             return []
         except Exception as e:
-            logging.error(f"Error getting unique values: {str(e)}")
+            logger.error(f"Error getting unique values: {str(e)}")
             return []
 
+    @_locked
+    def get_statistics(self) -> Dict:
+        """Summarize the database, recomputed only after it changes"""
+        if self._stats_cache is None:
+            self._stats_cache = self._compute_statistics()
+        return self._stats_cache
+
+    def _compute_statistics(self) -> Dict:
+        """Compute totals, departments, file types and date range"""
+        try:
+            df = self.metadata_df
+            stats = {'total_files': len(df)}
+            for key, column in (('departments', 'department'), ('file_types', 'file_extension')):
+                if column in df.columns:
+                    values = df[column].dropna().astype(str)
+                    stats[key] = sorted(values[values != ''].unique().tolist())
+                else:
+                    stats[key] = []
+
+            if 'last_modified' in df.columns and 'file_path' in df.columns:
+                modified = pd.to_datetime(df['last_modified'], errors='coerce').dropna()
+                if not modified.empty:
+                    stats['newest_file'] = df.at[modified.idxmax(), 'file_path']
+                    stats['oldest_file'] = df.at[modified.idxmin(), 'file_path']
+            return stats
+        except Exception as e:
+            logger.error(f"Error computing statistics: {str(e)}")
+            return {}
+
+    @_locked
     def clear_cache(self):
         """Clear metadata cache"""
-        self.metadata_cache.clear()
\ No newline at end of file
+        self.metadata_cache.clear()
+        self._stats_cache = None
\ No newline at end of file
@@ -0,0 +1,128 @@
+import os
+import re
+from datetime import datetime
+import pandas as pd
+import openpyxl
+from utils_file_info import file_extension
+
+try:
+    import pyarrow  # Optional; enables the Parquet working store
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# Backups rotate through this many fixed files
+MAX_BACKUPS = 10
+# Timestamped backups written before the ring, e.g. metadata_backup_20240131_170502.xlsx
+_LEGACY_BACKUP_NAME = re.compile(r'metadata_backup_\d{8}_\d{6}\.\w+')
+# Descriptive fields a newly added file starts with, all empty
+_EMPTY_FIELDS = (
+    'project_number', 'department', 'area', 'type', 'source', 'revision',
+    'issue_status', 'work_status', 'scale', 'paper_size', 'applicable_codes',
+    'equipment_tags', 'related_documents', 'priority', 'milestone',
+    'contract_phase', 'budget_code', 'deliverable_id', 'approved_by', 'comments'
+)
+
+
+def store_path_for(excel_path: str) -> str:
+    """Working store for a metadata workbook: Parquet beside it when available"""
+    return os.path.splitext(excel_path)[0] + '.parquet' if HAS_PARQUET else excel_path
+
+
+def basic_metadata_entry(file_path: str, stats: os.stat_result, date_added: datetime) -> dict:
+    """Row for a file newly added to the database: file details, other fields empty"""
+    file_location, file_name = os.path.split(file_path)
+    entry = {
+        'file_path': file_path,
+        'file_name': file_name,
+        'file_location': file_location,
+        'file_extension': file_extension(file_name).lower(),
+        'file_size': stats.st_size,
+        'date_added': date_added,
+        'last_modified': datetime.fromtimestamp(stats.st_mtime),
+    }
+    entry.update(dict.fromkeys(_EMPTY_FIELDS, ''))
+    return entry
+
+
+def read_excel(path: str) -> pd.DataFrame:
+    """Read a workbook with the calamine engine, falling back to pandas' default"""
+    try:
+        return pd.read_excel(path, engine="calamine")
+    except ImportError:
+        # python-calamine is optional
+        return pd.read_excel(path)
+
+
+def write_excel(df: pd.DataFrame, path: str):
+    """Write a values-only workbook row by row with a write-only openpyxl workbook"""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(df.columns))
+    # Missing values become empty cells, as with to_excel
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """Write a zstd-compressed Parquet file"""
+    df = df.copy()
+    # Arrow needs one type per column; text fields can hold numbers read from Excel
+    for column in df.columns:
+        if pd.api.types.infer_dtype(df[column], skipna=True).startswith('mixed'):
+            df[column] = df[column].astype('string')
+    df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+
+
+def read_store(path: str) -> pd.DataFrame:
+    """Read a metadata file in the format given by its extension"""
+    if path.endswith('.parquet'):
+        # Mapping the file lets Arrow read columns without an extra buffered copy
+        return pd.read_parquet(path, engine='pyarrow', memory_map=True)
+    return read_excel(path)
+
+
+def write_store(df: pd.DataFrame, path: str):
+    """Write a metadata file in the format given by its extension"""
+    if path.endswith('.parquet'):
+        write_parquet(df, path)
+    else:
+        write_excel(df, path)
+
+
+def backup_path_for(backup_dir: str, slot: int, extension: str) -> str:
+    """Path of one slot in the fixed ring of backup files"""
+    return os.path.join(backup_dir, f"metadata_backup_{slot}{extension}")
+
+
+def oldest_backup_slot(backup_dir: str, extension: str) -> int:
+    """Slot the next backup should overwrite: an unused one, else the oldest"""
+    oldest_slot, oldest_mtime = 0, None
+    for slot in range(MAX_BACKUPS):
+        try:
+            mtime = os.stat(backup_path_for(backup_dir, slot, extension)).st_mtime
+        except OSError:
+            return slot
+        if oldest_mtime is None or mtime < oldest_mtime:
+            oldest_slot, oldest_mtime = slot, mtime
+    return oldest_slot
+
+
+def write_backup(df: pd.DataFrame, backup_dir: str, slot: int, extension: str):
+    """Overwrite a backup slot, replacing the old file only once the new one is complete"""
+    path = backup_path_for(backup_dir, slot, extension)
+    temp_path = os.path.join(backup_dir, f"metadata_backup_{slot}.tmp{extension}")
+    write_store(df, temp_path)
+    os.replace(temp_path, path)
+
+
+def remove_legacy_backups(backup_dir: str) -> int:
+    """Delete timestamped backups left from before the ring; returns how many were removed"""
+    removed = 0
+    for name in os.listdir(backup_dir):
+        if _LEGACY_BACKUP_NAME.fullmatch(name):
+            os.remove(os.path.join(backup_dir, name))
+            removed += 1
+    return removed
@@ -1,35 +1,41 @@
 import os
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Optional, Tuple
 import socket
 from pathlib import Path
 
+try:
+    import win32wnet  # pywin32, used to list mapped network drives on Windows
+except ImportError:
+    win32wnet = None
+
+logger = logging.getLogger('path_manager')
+
+# Folder walks with at least this many subfolders below the start list them in parallel
+_PARALLEL_WALK_THRESHOLD = 8
+_NORMALIZE_CACHE_SIZE = 16384
+
 class PathManager:
-    def __init__(self, root_path: str = "P:/"):
+    def __init__(self, root_path: str = "P:/", walker_threads: int = 8):
         self.root_path = root_path
+        # Overlaps folder listings on network drives during large walks
+        self._walker_pool = ThreadPoolExecutor(max_workers=walker_threads)
         self.network_available = False
         self.mapped_drives = {}
-        self.setup_logging()
+        self._normalized_cache: Dict[Tuple[str, str], str] = {}  # (root, path) -> normalized path
         self.verify_network_access()
 
-    def setup_logging(self):
-        """Configure logging for path operations"""
-        logging.basicConfig(
-            filename='path_operations.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-
     def verify_network_paths(self, paths: Dict[str, str]) -> bool:
         """Verify network paths are accessible"""
         try:
             for key, path in paths.items():
                 if not os.path.exists(path):
-                    logging.warning(f"Network path not accessible: {path}")
+                    logger.warning(f"Network path not accessible: {path}")
                     return False
             return True
         except Exception as e:
-            logging.error(f"Error verifying network paths: {str(e)}")
+            logger.error(f"Error verifying network paths: {str(e)}")
             return False
 
     def verify_network_access(self) -> bool:
@@ -41,16 +47,16 @@ class PathManager:
             # Check if root path exists and is accessible
             if os.path.exists(self.root_path):
                 self.network_available = True
-                logging.info(f"Network access verified. Root path: {self.root_path}")
+                logger.info(f"Network access verified. Root path: {self.root_path}")
                 return True
             else:
                 self.network_available = False
-                logging.error(f"Root path not accessible: {self.root_path}")
+                logger.error(f"Root path not accessible: {self.root_path}")
                 return False
 
         except Exception as e:
             self.network_available = False
-            logging.error(f"Network verification failed: {str(e)}")
+            logger.error(f"Network verification failed: {str(e)}")
             return False
     
 
@@ -58,15 +64,18 @@ class PathManager:
         """Get dictionary of mapped network drives"""
         drives = {}
         try:
-            if os.name == 'nt':  # Windows
-                import win32wnet
-                for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-                    try:
-                        drive = f"{letter}:"
-                        win32wnet.WNetGetConnection(drive)
-                        drives[drive] = os.path.realpath(drive)
-                    except:
-                        continue
+            if os.name == 'nt' and win32wnet is None:
+                logger.warning("pywin32 is not installed; mapped drives cannot be listed")
+            elif os.name == 'nt':  # Windows
+                letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                # Each probe is a round trip to the redirector, so ask about every letter at once
+                with ThreadPoolExecutor(max_workers=len(letters)) as pool:
+                    probes = {f"{letter}:": pool.submit(self._probe_drive, f"{letter}:")
+                              for letter in letters}
+                for drive, probe in probes.items():
+                    target = probe.result()
+                    if target:
+                        drives[drive] = target
             else:  # Linux/Mac
                 # Implement equivalent for other OS
                 pass
@@ -75,11 +84,37 @@ class PathManager:
             return drives
 
         except Exception as e:
-            logging.error(f"Error getting mapped drives: {str(e)}")
+            logger.error(f"Error getting mapped drives: {str(e)}")
             return {}
 
+    @staticmethod
+    def _probe_drive(drive: str) -> Optional[str]:
+        """Resolved path of a mapped drive, or None if the letter is not mapped"""
+        try:
+            win32wnet.WNetGetConnection(drive)
+            return os.path.realpath(drive)
+        except win32wnet.error as e:
+            # Expected for every letter that is unused or a local disk
+            logger.debug(f"No network connection for {drive}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.warning(f"Error probing drive {drive}: {str(e)}")
+            return None
+
     def normalize_path(self, path: str) -> str:
         """Normalize path format for consistency"""
+        # The same paths are normalized repeatedly while verifying and resolving
+        key = (self.root_path, path)
+        normalized = self._normalized_cache.get(key)
+        if normalized is None:
+            normalized = self._normalize_path(path)
+            if len(self._normalized_cache) >= _NORMALIZE_CACHE_SIZE:
+                self._normalized_cache.clear()
+            self._normalized_cache[key] = normalized
+        return normalized
+
+    def _normalize_path(self, path: str) -> str:
+        """Normalize one path without consulting the cache"""
         try:
             # Convert to absolute path
             if not os.path.isabs(path):
@@ -95,7 +130,7 @@ class PathManager:
             return normalized
 
         except Exception as e:
-            logging.error(f"Error normalizing path {path}: {str(e)}")
+            logger.error(f"Error normalizing path {path}: {str(e)}")
             return path
 
     def get_relative_path(self, path: str) -> str:
@@ -104,7 +139,7 @@ class PathManager:
             absolute_path = self.normalize_path(path)
             return os.path.relpath(absolute_path, self.root_path)
         except Exception as e:
-            logging.error(f"Error getting relative path for {path}: {str(e)}")
+            logger.error(f"Error getting relative path for {path}: {str(e)}")
             return path
 
     def resolve_path(self, path: str) -> Optional[str]:
@@ -123,7 +158,7 @@ class PathManager:
             return normalized
 
         except Exception as e:
-            logging.error(f"Error resolving path {path}: {str(e)}")
+            logger.error(f"Error resolving path {path}: {str(e)}")
             return None
 
     def verify_path(self, path: str) -> bool:
@@ -138,7 +173,7 @@ class PathManager:
             return os.path.exists(normalized_path)
 
         except Exception as e:
-            logging.error(f"Error verifying path {path}: {str(e)}")
+            logger.error(f"Error verifying path {path}: {str(e)}")
             return False
 
     def get_subfolders(self, path: str) -> List[str]:
@@ -151,7 +186,7 @@ class PathManager:
                    if os.path.isdir(os.path.join(path, d))]
 
         except Exception as e:
-            logging.error(f"Error getting subfolders for {path}: {str(e)}")
+            logger.error(f"Error getting subfolders for {path}: {str(e)}")
             return []
 
     def get_folder_structure(self, path: str, max_depth: int = -1) -> Dict:
@@ -161,27 +196,79 @@ class PathManager:
             if not self.verify_path(path) or max_depth == 0:
                 return structure
 
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    structure[item] = self.get_folder_structure(
-                        item_path, 
-                        max_depth - 1 if max_depth > 0 else -1
-                    )
+            # Each item fills in its folder's dict
+            subfolders = self._list_subfolders(path)
+            pending = []
+            for name, child_path in subfolders:
+                child = structure[name] = {}
+                pending.append((child_path, child, max_depth - 1 if max_depth > 0 else -1))
+
+            if len(pending) >= _PARALLEL_WALK_THRESHOLD:
+                self._walk_parallel(pending)
+            else:
+                self._walk_serial(pending)
 
             return structure
 
         except Exception as e:
-            logging.error(f"Error getting folder structure for {path}: {str(e)}")
+            logger.error(f"Error getting folder structure for {path}: {str(e)}")
             return structure
 
+    def _walk_serial(self, stack: List[Tuple[str, Dict, int]]):
+        """Fill in folder dicts one listing at a time"""
+        while stack:
+            folder, node, depth = stack.pop()
+            if depth == 0:
+                continue
+            for name, child_path in self._list_subfolders(folder):
+                child = node[name] = {}
+                stack.append((child_path, child, depth - 1 if depth > 0 else -1))
+
+    def _walk_parallel(self, items: List[Tuple[str, Dict, int]]):
+        """Fill in folder dicts with listings running on the walker pool"""
+        pending = {}  # future -> (folder dict, remaining depth)
+        for folder, node, depth in items:
+            if depth != 0:
+                pending[self._walker_pool.submit(self._list_subfolders, folder)] = (node, depth)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                node, depth = pending.pop(future)
+                child_depth = depth - 1 if depth > 0 else -1
+                for name, child_path in future.result():
+                    child = node[name] = {}
+                    if child_depth != 0:
+                        pending[self._walker_pool.submit(self._list_subfolders, child_path)] = (
+                            child, child_depth)
+
+    @staticmethod
+    def _list_subfolders(folder: str) -> List[Tuple[str, str]]:
+        """(name, path) of a folder's subfolders, empty if it cannot be read"""
+        try:
+            with os.scandir(folder) as entries:
+                return [(entry.name, entry.path) for entry in entries
+                        if entry.is_dir(follow_symlinks=False)]
+        except OSError as e:
+            # An unreadable folder stays empty, the rest of the tree is kept
+            logger.error(f"Error getting folder structure for {folder}: {str(e)}")
+            return []
+
     def create_path_tree(self, paths: List[str]) -> Dict:
         """Create tree structure from list of paths"""
         tree = {}
         try:
+            # Resolve the root once rather than renormalizing it for every path
+            root = os.path.normpath(self.root_path)
             for path in paths:
                 current = tree
-                parts = self.get_relative_path(path).split('/')
+                if not os.path.isabs(path):
+                    path = os.path.join(root, path)
+                try:
+                    relative = os.path.relpath(path, root)
+                except ValueError:
+                    # On another drive than the root; keep the full path
+                    relative = os.path.normpath(path)
+                parts = relative.replace('\\', '/').split('/')
                 
                 for part in parts:
                     if part not in current:
@@ -191,7 +278,7 @@ class PathManager:
             return tree
 
         except Exception as e:
-            logging.error(f"Error creating path tree: {str(e)}")
+            logger.error(f"Error creating path tree: {str(e)}")
             return {}
 
     def monitor_network_status(self):
@@ -201,9 +288,9 @@ class PathManager:
         
         if current_status != previous_status:
             if current_status:
-                logging.info("Network connection restored")
+                logger.info("Network connection restored")
             else:
-                logging.warning("Network connection lost")
+                logger.warning("Network connection lost")
                 
         return current_status
 